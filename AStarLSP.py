@@ -1,39 +1,63 @@
 import random
+from array import array
 from math import sqrt
 from queue import PriorityQueue
 from collections import defaultdict
 
 # from Driver import Graph
 from heapq import heappush, heappop
+from itertools import repeat
+from anytime import CHARGE_EVERY, Budget
+from heuristics import CoordinateHeuristic, LandmarkIndex
+from instrumentation import current, phase
+from trialScheduler import TrialScheduler
 
 class Astar:
-    
-                        
-    def euclideanDist(self, pos1, pos2):
-        x1, y1 = pos1
-        x2, y2 = pos2
-        return sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
-
-    def searchLSP(self, lcc, edges, g):
+
+    # landmarks: number of ALT landmarks for the default graph-only heuristic
+    def __init__(self, landmarks=8):
+        self.landmarks = landmarks
+        self.scratch = None
+        self.generation = 0
+
+    # Heuristic objects expose estimate(u, t), a lower bound on the hops from u to t.
+    # Landmarks work on every graph; coordinates are only meaningful for geometric graphs.
+    def buildHeuristic(self, lcc, g, kind="landmark"):
+        with phase("heuristic"):
+            if kind == "coordinate":
+                if not g.hasCoordinates:
+                    raise ValueError("The coordinate heuristic needs a graph with vertex positions")
+                return CoordinateHeuristic(g)
+            return LandmarkIndex(g, lcc, self.landmarks)
+
+    # batched=True answers all sampled targets with one expansion per source, taking sources
+    # from a TrialScheduler (at most sqrt(n), fewer once they stop improving); batched=False
+    # runs a separate search for every (source, target) pair of sqrt(n) random sources
+    def searchLSP(self, lcc, g, heuristic=None, batched=True):
+        if heuristic is None:
+            heuristic = self.buildHeuristic(lcc, g)
+        estimate = heuristic.estimate
         n_samples = int(sqrt(len(lcc)))
-        sources = random.sample(lcc, n_samples)
         targets = random.sample(lcc, n_samples)
+        if batched:
+            return self.searchBatched(g, TrialScheduler(g, lcc, n_samples), targets, heuristic)[0]
+        sources = random.sample(lcc, n_samples)
 
         max_distance = float('-inf')  
 
         for source in sources:
             for target in targets:
+                # Deepest vertex first; among equally deep ones the heuristic prefers the one
+                # estimated closest to the target
                 pq = []  
                 inDist = {source: 0}  
-                fiDist = {source: self.euclideanDist((edges[source][1], edges[source][2]), (edges[source][4], edges[source][5]))}  
-                heappush(pq,(-fiDist[source], source))
+                heappush(pq,(0, estimate(source, target), source))
 
                 visited = set() 
                 current_distance = 0 
 
                 while pq: 
-                    estimated_total_distance,current_node = heappop(pq)  
-                    estimated_total_distance = -estimated_total_distance
+                    _, _, current_node = heappop(pq)  
 
                     if current_node == target: 
                         current_distance = inDist[current_node] 
@@ -48,10 +72,116 @@ class Astar:
                         temp = inDist[current_node] + 1 
                         if neighbor not in inDist or temp > inDist[neighbor]:
                             inDist[neighbor] = temp
-                            fiDist[neighbor] = inDist[neighbor] - self.euclideanDist((edges[neighbor][1], edges[neighbor][2]), (edges[neighbor][4], edges[neighbor][5]))
-                            heappush(pq,(-fiDist[neighbor], neighbor))
+                            heappush(pq,(-temp, estimate(neighbor, target), neighbor))
 
                 max_distance = max(max_distance, current_distance)  
                 
-        return max_distance 
-            
\ No newline at end of file
+        return max_distance
+
+    # Distance and visited arrays shared by every search on graphs of this size. An entry is
+    # only valid when its stamp equals the current generation, so starting a new search is a
+    # counter increment instead of a reallocation.
+    def scratchArrays(self, n):
+        if self.scratch is None or len(self.scratch[0]) != n:
+            self.scratch = tuple(array('i', bytes(4 * n)) for _ in range(4))
+            self.generation = 0
+        return self.scratch
+
+    # One expansion per source: the search keeps going until every target has been popped
+    # and records each target's depth when it is reached. Ties between equally deep vertices
+    # go to the one estimated closest to the nearest target.
+    # Returns (longest target depth, path to that target as dense indices). With a budget the
+    # best path is offered as it improves and the search stops once the budget is spent.
+    # sources may be a TrialScheduler, which is told the best depth after every source.
+    # Depths are weighted lengths when g carries edge weights.
+    def searchBatched(self, g, sources, targets, heuristic, budget=None):
+        offsets = g.offsets
+        neighbors = g.neighbors
+        weights = g.weights
+        distStamp, dist, visitStamp, parent = self.scratchArrays(g.numVertices())
+        estimate = heuristic.setEstimator(targets)
+        isTarget = bytearray(g.numVertices())
+        for target in targets:
+            isTarget[target] = 1
+        targetCount = sum(isTarget)
+
+        max_distance = float('-inf')
+        best_path = []
+        ticks = 0
+        popped = 0
+        pushes = 0
+        for source in sources:
+            self.generation += 1
+            generation = self.generation
+            distStamp[source] = generation
+            dist[source] = 0
+            parent[source] = -1
+            pq = [(0, estimate(source), source)]
+            remaining = targetCount
+
+            while pq and remaining:
+                _, _, current_node = heappop(pq)
+                if visitStamp[current_node] == generation:
+                    continue
+                visitStamp[current_node] = generation
+                popped += 1
+                if isTarget[current_node]:
+                    remaining -= 1
+                    if dist[current_node] > max_distance:
+                        max_distance = dist[current_node]
+                        best_path = []
+                        node = current_node
+                        while node != -1:
+                            best_path.append(node)
+                            node = parent[node]
+                        best_path.reverse()
+                        if budget is not None:
+                            budget.offer(max_distance, best_path)
+                if budget is not None:
+                    ticks += 1
+                    if ticks == CHARGE_EVERY:
+                        ticks = 0
+                        if budget.charge(CHARGE_EVERY):
+                            self.countExpansions(popped, pushes)
+                            return max_distance, best_path
+
+                depth = dist[current_node]
+                row = offsets[current_node]
+                end = offsets[current_node + 1]
+                steps = repeat(1) if weights is None else weights[row:end]
+                for neighbor, step in zip(neighbors[row:end], steps):
+                    if visitStamp[neighbor] == generation:
+                        continue
+                    temp = depth + step
+                    if distStamp[neighbor] != generation or temp > dist[neighbor]:
+                        distStamp[neighbor] = generation
+                        dist[neighbor] = temp
+                        parent[neighbor] = current_node
+                        heappush(pq, (-temp, estimate(neighbor), neighbor))
+                        pushes += 1
+
+            if remaining:
+                # Targets outside the source's component count as 0, as in the pairwise search
+                max_distance = max(max_distance, 0)
+            if isinstance(sources, TrialScheduler):
+                sources.record(max_distance, best_path)
+        self.countExpansions(popped, pushes)
+        return max_distance, best_path
+
+    # Hand the counts kept in searchBatched's locals to the active Stats, if any
+    def countExpansions(self, popped, pushes):
+        stats = current()
+        if stats is not None:
+            stats.count("verticesPopped", popped)
+            stats.count("heapPushes", pushes)
+
+    # The batched search over sqrt(n) sampled targets and scheduled sources
+    def searchAnytime(self, g, component, budget=None, heuristic=None):
+        budget = budget or Budget()
+        budget.start()
+        if heuristic is None:
+            heuristic = self.buildHeuristic(component, g)
+        n_samples = int(sqrt(len(component)))
+        targets = random.sample(component, n_samples)
+        self.searchBatched(g, TrialScheduler(g, component, n_samples), targets, heuristic, budget)
+        return budget.result()
@@ -1,28 +1,104 @@
 import random
-from collections import defaultdict
+from itertools import repeat
 # from Driver import Graph
+from anytime import Budget
+from instrumentation import count, phase
+from multiSourceBFS import bitParallelBFS, sweep
+from parallelTrials import runTrials
+from trialScheduler import TrialScheduler
 
 class DFS:
 
     def searchLSP(self, component, g):
-        Lmax = 0
+        return self.searchLSPBounds(component, g)[0]
+
+    # sqrt(n) random DFS trials from distinct TrialScheduler starts, each reporting the depth
+    # of its DFS tree. A double sweep with the bit-parallel BFS engine (random starts, then
+    # their farthest nodes) only bounds the eccentricities: they bracket the BFS diameter,
+    # which is itself a lower bound on the LSP. Returns
+    # (LSP lower bound, eccentricity lower bound, eccentricity upper bound); the eccentricity
+    # bounds are also reported as the eccentricityLower/eccentricityUpper counters.
+    def searchLSPBounds(self, component, g, width=64):
         trials = int(len(component) ** 0.5)
-        for _ in range(trials):
-            u = random.choice(component)
-            v = self.findDeepestNode(u,g)
-            w = self.findDeepestNode(v,g)
-            Lmax = max(Lmax, w)
-        return Lmax
+        starts = [random.choice(component) for _ in range(width)]
+        with phase("sweep"):
+            first = sweep(g, starts, width)
+            second = sweep(g, first.farthest, width)
+
+        eccentricities = first.eccentricity + second.eccentricity
+        lower = max(eccentricities)
+        upper = 2 * min(eccentricities)
+        count("eccentricityLower", lower)
+        count("eccentricityUpper", upper)
+
+        # Every trial is an independent sample, so none is cut for lack of improvement
+        scheduler = TrialScheduler(g, component, trials, patience=trials)
+        Lmax = lower
+        for start in scheduler:
+            Lmax = max(Lmax, self.findDeepestNode(start, g))
+            scheduler.record(Lmax)
+        return Lmax, lower, upper
+
+    # Each trial runs a BFS from a TrialScheduler start and a DFS from its farthest node,
+    # offering the DFS-tree path
+    def searchAnytime(self, g, component, budget=None, trials=None):
+        budget = budget or Budget()
+        budget.start()
+        scheduler = TrialScheduler(g, component, trials)
+        for u in scheduler:
+            far = bitParallelBFS(g, [u]).farthest[0]
+            length, path = self.findDeepestPath(far, g)
+            budget.offer(length, path)
+            scheduler.record(length, path)
+            if budget.charge(2 * len(component)):
+                break
+        return budget.result()
+
+    # Run sqrt(n) independent trials on a process pool over a shared-memory copy of the graph.
+    # Each trial runs a BFS from a random start and a DFS from that start's farthest node.
+    # Returns (longest depth, tree path of dense indices that achieved it).
+    def searchLSPParallel(self, component, g, workers=None, seed=0):
+        trials = int(len(component) ** 0.5)
+        return runTrials(g, component, "dfs", trials, workers, seed)
+
+    # findDeepestNode that also returns the DFS-tree path down to the deepest node
+    def findDeepestPath(self, start, g):
+        weights = getattr(g, 'weights', None)
+        parent = {start: None}
+        depth = {start: 0}
+        stack = [start]
+        deepest = start
+        while stack:
+            v = stack.pop()
+            steps = repeat(1) if weights is None else weights[g.offsets[v]:g.offsets[v + 1]]
+            for neighbor, step in zip(g.adjList[v], steps):
+                if neighbor not in depth:
+                    depth[neighbor] = depth[v] + step
+                    parent[neighbor] = v
+                    if depth[neighbor] > depth[deepest]:
+                        deepest = neighbor
+                    stack.append(neighbor)
+        count("verticesPopped", len(depth))
+        path = []
+        while deepest is not None:
+            path.append(deepest)
+            deepest = parent[deepest]
+        path.reverse()
+        return depth[path[-1]], path
 
+    # Depth of the deepest node in a DFS tree from start; weighted when g has edge weights
     def findDeepestNode(self, start, g):
+        weights = getattr(g, 'weights', None)
         depth = {start: 0}
         stack = [start]
         maxDepth = 0
         while stack:
             v = stack.pop()
-            for neighbor in g.adjList[v]:
+            steps = repeat(1) if weights is None else weights[g.offsets[v]:g.offsets[v + 1]]
+            for neighbor, step in zip(g.adjList[v], steps):
                 if neighbor not in depth:
-                    depth[neighbor] = depth[v] + 1
+                    depth[neighbor] = depth[v] + step
                     maxDepth = max(maxDepth, depth[neighbor])
                     stack.append(neighbor)
+        count("verticesPopped", len(depth))
         return maxDepth
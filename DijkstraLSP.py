@@ -1,40 +1,102 @@
-import heapq
-from collections import defaultdict
+import random
+from array import array
+from itertools import repeat
+
+from anytime import Budget
+from instrumentation import current
+
 
 class Dijkstra:
-    def initialize(self, g):
-            nodeMap = {}
-            for v in g:
-                v.distance = float("-inf")  # Distance value
-                v.parent = None  # Predecessor
-                nodeMap[v.node] = v
-            return nodeMap
-    
-    def searchLSP(self, g, start, lcc):
-            nodeMap = self.initialize(lcc)
-            unvisited = set(lcc)
-            start.distance = 0
-            vlcc = 0
-
-            while unvisited:
-                farthest = max(unvisited, key=lambda vertex: vertex.distance)
-                unvisited.remove(farthest)
-
-                for neighbor in g.adjList[farthest.node]:
-                    if nodeMap[neighbor] in unvisited:
-                        new_distance = max(nodeMap[neighbor].distance, farthest.distance + 1)
-                        self.relax(farthest, nodeMap[neighbor], new_distance)
-
-            
-            longest_path = []
-            current = max(lcc, key=lambda vertex: vertex.distance)
-            while current:
-                longest_path.append(current)
-                current = current.parent
-
-            return longest_path
-
-    def relax(self, farthest, neighbor, new_distance):
-            if new_distance > neighbor.distance:
-                neighbor.distance = new_distance
-                neighbor.parent = farthest
\ No newline at end of file
+    # Longest-distance Dijkstra on a CSRGraph. start may be a single vertex or a list of
+    # start vertices (dense indices or vertex handles); the longest path over all starts is
+    # returned as a list of dense indices. All per-run state lives in local arrays, so the
+    # graph is never written to and concurrent runs may share it. On a weighted graph the
+    # distances, and the path chosen, are weighted lengths.
+    def searchLSP(self, g, start, lcc, budget=None):
+        starts = start if isinstance(start, (list, tuple, range, array)) else [start]
+        n = g.numVertices()
+        inLCC = bytearray(n)
+        members = [getattr(v, 'node', v) for v in lcc]
+        for v in members:
+            inLCC[v] = 1
+
+        dist = array('i', [-1]) * n
+        parent = array('i', [-1]) * n
+        longest_path = []
+        longest_length = -1
+        for s in starts:
+            s = getattr(s, 'node', s)
+            for v in members:
+                dist[v] = -1
+                parent[v] = -1
+            end = self.searchFrom(g, s, inLCC, dist, parent)
+            if dist[end] > longest_length:
+                longest_length = dist[end]
+                path = []
+                current = end
+                while current != -1:
+                    path.append(current)
+                    current = parent[current]
+                longest_path = path
+            if budget is not None:
+                budget.offer(longest_length, longest_path)
+                if budget.charge(len(members)):
+                    break
+        return longest_path
+
+    # `trials` random starts, one by default like the Driver
+    def searchAnytime(self, g, component, budget=None, trials=1):
+        budget = budget or Budget()
+        budget.start()
+        starts = [random.choice(component) for _ in range(trials)]
+        self.searchLSP(g, starts, component, budget)
+        return budget.result()
+
+    # Expand the unvisited vertex with the largest tentative distance first. Edge weights are
+    # small integers (1 unless g.weights says otherwise), so tentative distances are too and
+    # a bucket queue replaces the linear max() scan; stale bucket entries are skipped when popped.
+    # Returns the vertex that ended with the largest distance.
+    def searchFrom(self, g, start, inLCC, dist, parent):
+        offsets = g.offsets
+        neighbors = g.neighbors
+        weights = g.weights
+        visited = bytearray(len(inLCC))
+        dist[start] = 0
+        buckets = [[start]]
+        top = 0
+        farthest = start
+        relaxed = 0
+
+        while top >= 0:
+            bucket = buckets[top]
+            if not bucket:
+                top -= 1
+                continue
+            v = bucket.pop()
+            if visited[v] or dist[v] != top:
+                continue
+            visited[v] = 1
+            if top > dist[farthest]:
+                farthest = v
+
+            highest = top
+            row = offsets[v]
+            steps = repeat(1) if weights is None else weights[row:offsets[v + 1]]
+            for w, step in zip(neighbors[row:offsets[v + 1]], steps):
+                new_distance = top + step
+                if inLCC[w] and not visited[w] and new_distance > dist[w]:
+                    dist[w] = new_distance
+                    parent[w] = v
+                    relaxed += 1
+                    while new_distance >= len(buckets):
+                        buckets.append([])
+                    buckets[new_distance].append(w)
+                    if new_distance > highest:
+                        highest = new_distance
+            top = highest
+
+        stats = current()
+        if stats is not None:
+            stats.count("verticesPopped", sum(visited))
+            stats.count("edgesRelaxed", relaxed)
+        return farthest
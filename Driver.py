@@ -1,188 +1,54 @@
-import random
-import math
-from collections import defaultdict
+import argparse
+import csv
+import json
+import os
+import sys
 # Import pathfinding algorithms
-from AStarLSP import Astar
-from DFSLSP import DFS
-from DijkstraLSP import Dijkstra
+from algorithms import ALGORITHMS, EXTRA_ALGORITHMS, PARALLEL_ALGORITHMS, algorithmParameters
+from anytime import Budget
 from generateGraph import GeometricGraph
-from OwnHeuristicLSP import OwnHeuristic
-import matplotlib.pyplot as plt
-
-class Vertex:
-    # Initialize a graph vertex with coordinates and a node identifier
-    def __init__(self, x, y, node):
-        self.x = x
-        self.y = y
-        self.node = node
-        self.distance = float('-inf')  # Used for distance calculations in pathfinding
-        self.parent = None  # Pointer to parent vertex in a path
+from graphReduction import reduceGraph
+from instrumentation import DISABLED, Stats, collecting, count, phase
+from graphLoader import GRAPH_DIR, loadGraph
+from parallelTrials import runAlgorithms, timedTrials
+from pathImprovement import improvePath
+from resultCache import ResultCache, lccDigest, resultKey
 
 class Graph:
-    # Initialize an empty graph with adjacency list and set of vertices
-    def __init__(self):
-        self.adjList = defaultdict(list)
-        self.verticeSet = set()
-        self.vertices = []
-        self.verticeMap = {}
-
-    # Add an edge between two vertices u and v in the graph
-    def addEdge(self, u, v):
-        self.adjList[u].append(v)
-        self.adjList[v].append(u)
-        
-    # Add vertex with optional coordinates to the graph
-    def addVertex(self, u, v, x1=0, y1=0, x2=0, y2=0):
-        ver1 = Vertex(x1, y1, u)
-        ver2 = Vertex(x2, y2, v)
-        if u not in self.verticeSet:
-            self.vertices.append(ver1)
-            self.verticeMap[u] = ver1
-        
-        if v not in self.verticeSet:
-            self.vertices.append(ver2)
-            self.verticeMap[v] = ver2
-        
-        self.verticeSet.update([u, v])
-
-    # Recursive DFS to find components in the graph
-    def DFS(self, v, visited, component, d):
-        visited.add(v)
-        
-        if d == 1:
-            component.append(self.verticeMap[v])
-        else:
-            component.append(v)    
-        for neighbor in self.adjList[v]:
-            if neighbor not in visited:
-                self.DFS(neighbor, visited, component, d)
-
-    # Find the largest connected component in the graph
-    def findLCC(self, d=0):
-        visited = set()
-        largestComponent = []
-        for v in self.verticeSet:
-            if v not in visited:
-                component = []
-                self.DFS(v, visited, component, d)
-                if len(component) > len(largestComponent):
-                    largestComponent = component    
-        return largestComponent
-    
-    # Read graph from file to create edges and vertices
-    def readGraphFromFile(self, filename):
-        edges = []
-        with open("graphs/"+filename, 'r') as file:
-            for line in file:
-                components = line.strip().split()
-                if len(components) == 2:
-                    u, v = map(int, components)
-                    self.addEdge(u, v)
-                    self.addVertex(u, v)
-                else:
-                    u = int(components[0])
-                    x1, y1 = map(float, components[1:3])
-                    v = int(components[3])
-                    x2, y2 = map(float, components[4:])
-                    self.addEdge(u, v)
-                    self.addVertex(u, v, x1, y1, x2, y2)
-                    edges.append((int(u), x1, y1, int(v), x2, y2))
-        return edges    
-    
-    # Visualize the graph using matplotlib
-    def visualize(self):
-        
-        plt.figure(figsize=(8, 6)) 
-        
-        nodes = list(self.vertices)  
-        x_coords = [v.x for v in nodes] 
-        y_coords = [v.y for v in nodes]  
-        for vertex, neighbors in self.adjList.items():
-            x1 = self.verticeMap[vertex].x
-            y1 = self.verticeMap[vertex].y
-            for neighbor in neighbors:
-                x2 = self.verticeMap[neighbor].x
-                y2 = self.verticeMap[neighbor].y
-                plt.plot([x1, x2], [y1, y2], 'b-o', alpha=0.7) 
-
-        
-        plt.scatter(x_coords, y_coords, color='red', s=50, alpha=0.7) 
-        for vertex in nodes:
-            plt.annotate(vertex.node, (vertex.x,vertex.y), textcoords="offset points", xytext=(0, 10), ha='center')
-        
-        plt.title("Graph Visualization")
-        plt.xlabel("X-axis")
-        plt.ylabel("Y-axis")
-        plt.axis('off')  
-        plt.show()
-    
-    # Find optimal radius for connectivity using binary search
-    def findOptimalR(self, n, minFraction, maxFraction):
-        low = 0
-        high = math.sqrt(2)
-        while high - low > 0.001:
-            mid = (low + high) / 2
+    # Find a radius whose LCC fraction lies in [minFraction, maxFraction] with a percolation
+    # sweep over one point set; pass graph to pick r for the instance that will be saved.
+    # The points are redrawn only if their LCC jumps over the whole window.
+    def findOptimalR(self, n, minFraction, maxFraction, graph=None):
+        if graph is None:
             graph = GeometricGraph(n)
-            graph.addEdges(mid)
-            lccSize = graph.largestConnectedComponent()
-            if lccSize < minFraction * n:
-                low = mid
-            elif lccSize > maxFraction * n:
-                high = mid
-            else:
-                break
-        return mid
-    
-    # Calculate maximum and average degrees of vertices in the largest connected component
-    def getlccdegrees(self, lcc):
-        mdegree = 0
-        total_degree = 0
-        node_count = 0
-
-        for node in lcc:
-            visited = set()
-            queue = [node]
-            while queue:
-                current_node = queue.pop(0)
-                visited.add(current_node)
-                mdegree = max(mdegree, len(self.adjList[current_node]))
-                total_degree += len(self.adjList[current_node])
-                node_count += 1
-                for neighbor in self.adjList[current_node]:
-                    if neighbor not in visited and neighbor not in queue:
-                        queue.append(neighbor)
-
-        adegree = total_degree / node_count if node_count != 0 else 0
-
-        return mdegree, adegree    
-
+        return graph.fitRadius(minFraction, maxFraction)
 
 
 def generate():
     g= Graph()
     
     n300 = 300
-    optimalR300 = g.findOptimalR(n300, 0.9, 0.95)
-    print("Optimal r for n = 300:", optimalR300)
     graph300 = GeometricGraph(n300)
+    optimalR300 = g.findOptimalR(n300, 0.9, 0.95, graph300)
+    print("Optimal r for n = 300:", optimalR300)
     graph300.addEdges(optimalR300)
     graph300.saveGraphToFile("graph_n300.edges")
     graph300.saveGraphToMtxFile("graph_n300.mtx")
 
     # Graph with n = 400
     n400 = 400
-    optimalR400 = g.findOptimalR(n400, 0.8, 0.9)
-    print("Optimal r for n = 400:", optimalR400)
     graph400 = GeometricGraph(n400)
+    optimalR400 = g.findOptimalR(n400, 0.8, 0.9, graph400)
+    print("Optimal r for n = 400:", optimalR400)
     graph400.addEdges(optimalR400)
     graph400.saveGraphToFile("graph_n400.edges")
     graph400.saveGraphToMtxFile("graph_n400.mtx")
     
     # Graph with n = 500
     n500 = 500
-    optimalR500 = g.findOptimalR(n500, 0.7, 0.8)
-    print("Optimal r for n = 500:", optimalR500)
     graph500 = GeometricGraph(n500)
+    optimalR500 = g.findOptimalR(n500, 0.7, 0.8, graph500)
+    print("Optimal r for n = 500:", optimalR500)
     graph500.addEdges(optimalR500)
     graph500.saveGraphToFile("graph_n500.edges")
     graph500.saveGraphToMtxFile("graph_n500.mtx")
@@ -193,159 +59,165 @@ def generate():
                       f"{n500} {optimalR500}\n")
 
     
-def dfslsp():
-    graphs = ['graph_n300.edges', 'graph_n400.edges', 'graph_n500.edges', 'DSJC500-5.mtx', 'inf-euroroad.edges', 'inf-power.mtx']
+GRAPHS = ['graph_n300.edges', 'graph_n400.edges', 'graph_n500.edges', 'DSJC500-5.mtx', 'inf-euroroad.edges', 'inf-power.mtx']
+HEADERS = ["Algorithm", "n", "r", "LCC Length", "Maximum Degree", "Average Degree", "LSP"]
+# Results of seeded runs, stored on disk and shared by the menu and batch mode
+RESULTS = ResultCache()
+# Seed of every menu run, so repeated options and all() reuse the stored results
+MENU_SEED = 0
+
+
+# Radius used to generate each graph_nNNN file, keyed by n
+def readRValues():
     extracted_values = {}
-    with open("graphs/n_rValues", 'r') as file:
+    if os.path.exists(os.path.join(GRAPH_DIR, "n_rValues")):
+        with open(os.path.join(GRAPH_DIR, "n_rValues"), 'r') as file:
             for line in file:
                 components = line.strip().split()
-                extracted_values[int(components[0])] = float(components[1])
-                    
-    for i, graph in enumerate(graphs):
-        g = Graph()
-        d = DFS()
-        print("For the graph: "+graph+" , below are the results for DFS Algorithm")   
-        if(i>=3):
-            print("\033[3mAs the graph is large, results are generating, please wait....\033[0m")  
-        edges = g.readGraphFromFile(graph)
-        lcc = g.findLCC()
-        
-        mD, aD = g.getlccdegrees(lcc)
-        
-        if(i<3):
-            r="{:.3f}".format(float(extracted_values.get(int(graph[graph.index("graph_n") + len("graph_n"):][:3]))))
+                if components:
+                    extracted_values[int(components[0])] = float(components[1])
+    return extracted_values
+
+
+def graphRadius(graph, rValues):
+    if graph.startswith("graph_n"):
+        r = rValues.get(int(graph[len("graph_n"):][:3]))
+        if r is not None:
+            return "{:.3f}".format(r)
+    return "-"
+
+
+class PreparedGraph:
+    # A graph loaded with its LCC and LCC degree statistics computed once, shared by every
+    # algorithm run on it. With collect=True the load/lcc/degrees timers land in self.stats;
+    # with reduce=True the LCC is also reduced once and the algorithms search the reduction.
+    def __init__(self, name, rValues, collect=False, reduce=False):
+        self.name = name
+        self.stats = Stats() if collect else None
+        self.reduction = None
+        self.digest = None
+        with collecting(self.stats) if collect else DISABLED:
+            self.graph = loadGraph(name)
+            self.lcc = self.graph.findLCC()
+            self.maxDegree, self.averageDegree = self.graph.getlccdegrees(self.lcc)
+            if reduce:
+                with phase("reduce"):
+                    self.reduction = reduceGraph(self.graph, self.lcc)
+                count("reducedVertices", self.reduction.graph.numVertices())
+                count("reducedEdges", self.reduction.graph.numEdges())
+        self.r = graphRadius(name, rValues)
+
+    def row(self, algorithm, lsp):
+        return [algorithm, self.graph.numVertices(), self.r, len(self.lcc),
+                "{:.2f}".format(self.maxDegree), "{:.2f}".format(self.averageDegree), lsp]
+
+    # (name, seed, LSP, seconds, stats) per run; on a reduction the LSP is the length of the
+    # path lifted back to the original graph. With improve=seconds every run's path is then
+    # lengthened by local search for at most that long. Algorithms named in parallelTrials
+    # run one at a time with their trials spread over the worker pool instead. With a
+    # ResultCache, seeded runs already stored for this LCC, algorithm, settings and seed are
+    # not repeated; they come back with the seconds and stats of the run that stored them.
+    # Unseeded runs are random samples and are never stored or reused.
+    def run(self, algorithms, seeds=(None,), workers=None, improve=None, cache=None,
+            parallelTrials=()):
+        tasks = [(name, seed) for name in algorithms for seed in seeds]
+        collect = self.stats is not None
+        keys = {(name, seed): self.cacheKey(name, seed, improve, name in parallelTrials)
+                for name, seed in tasks if cache is not None and seed is not None}
+        entries = {task: cache.get(key) for task, key in keys.items()}
+        missing = [task for task in tasks if entries.get(task) is None or
+                   (collect and entries[task]["stats"] is None)]
+        for name, seed, lsp, elapsed, stats, path in self.compute(missing, workers, improve,
+                                                                  parallelTrials):
+            entry = {"length": lsp, "path": path, "seconds": elapsed, "stats": stats}
+            if (name, seed) in keys:
+                cache.put(keys[name, seed], entry)
+            entries[name, seed] = entry
+        return [(name, seed, entries[name, seed]["length"], entries[name, seed]["seconds"],
+                 entries[name, seed]["stats"]) for name, seed in tasks]
+
+    # (name, seed, LSP, seconds, stats, path or None) per task, in no particular order
+    def compute(self, tasks, workers, improve, parallelTrials=()):
+        collect = self.stats is not None
+        pooled = [(name, seed) for name, seed in tasks if name in parallelTrials]
+        tasks = [(name, seed) for name, seed in tasks if name not in parallelTrials]
+        if self.reduction is None:
+            graph, component = self.graph, self.lcc
         else:
-            r="-"    
-        
-        dfslsp = d.searchLSP(lcc,g)
-        
-        headers = ["Algorithm", "n", "r", "LCC Length", "Maximum Degree", "Average Degree", "LSP"]
-        data = [
-    ["DFS", len(g.verticeSet), r, len(lcc), "{:.2f}".format(mD), "{:.2f}".format(aD), dfslsp]
-    ]        
-        formatted_table = format_table(headers, data)
-    
-        
-        print()
-        # Print the formatted table
-        print(formatted_table)
-        print()
+            graph, component = self.reduction.graph, self.reduction.component()
+        pooledResults = [timedTrials(name, seed, graph, component, workers, collect)
+                         for name, seed in pooled]
 
-def dijkstra():
-    graphs = ['graph_n300.edges', 'graph_n400.edges', 'graph_n500.edges', 'DSJC500-5.mtx', 'inf-euroroad.edges', 'inf-power.mtx']
-    extracted_values = {}
-    with open("graphs/n_rValues", 'r') as file:
-            for line in file:
-                components = line.strip().split()
-                extracted_values[int(components[0])] = float(components[1])
-                    
-    for i, graph in enumerate(graphs):
-        g = Graph()
-        di = Dijkstra()
-        print("For the graph: "+graph+" , below are the results for Dijkstra Algorithm")    
-        if(i>=3):
-            print("\033[3mAs the graph is large, results are generating, please wait....\033[0m")  
-        edges = g.readGraphFromFile(graph)
-        lcc = g.findLCC()
-        dilcc = g.findLCC(1)
-        mD, aD = g.getlccdegrees(lcc)
-        
-        if(i<3):
-            r="{:.3f}".format(float(extracted_values.get(int(graph[graph.index("graph_n") + len("graph_n"):][:3]))))
+        if self.reduction is None and improve is None:
+            return [result + (None,) for result in
+                    runAlgorithms(graph, component, tasks, workers, collect)] + \
+                [(name, seed, len(path) - 1, elapsed, stats, path)
+                 for name, seed, path, elapsed, stats in pooledResults]
+        results = runAlgorithms(graph, component, tasks, workers, collect, paths=True) + pooledResults
+        if self.reduction is not None:
+            results = [(name, seed, self.reduction.bestPath(path), elapsed, stats)
+                       for name, seed, path, elapsed, stats in results]
+        if improve is None:
+            return [(name, seed, len(path) - 1, elapsed, stats, path)
+                    for name, seed, path, elapsed, stats in results]
+        return [self.improve(result, improve) for result in results]
+
+    # Local search on one run's path; its time and move counters are added to the run's
+    def improve(self, result, seconds):
+        name, seed, path, elapsed, stats = result
+        budget = Budget(seconds=seconds)
+        if stats is None:
+            length, path = improvePath(self.graph, path, budget, seed)
         else:
-            r="-"    
-            
-        dilsp = di.searchLSP(g, random.choice(dilcc), dilcc)
-        
-        headers = ["Algorithm", "n", "r", "LCC Length", "Maximum Degree", "Average Degree", "LSP"]
-        data = [
-    ["Dijkstra", len(g.verticeSet), r, len(lcc), "{:.2f}".format(mD), "{:.2f}".format(aD), len(dilsp)]
-    ]        
-        formatted_table = format_table(headers, data)
-    
+            with collecting() as improved:
+                with phase("improve"):
+                    length, path = improvePath(self.graph, path, budget, seed)
+            improved.merge(stats)
+            stats = improved.asDict()
+        return name, seed, length, elapsed + budget.elapsed(), stats, path
+
+    def cacheKey(self, name, seed, improve, parallelTrials=False):
+        if self.digest is None:
+            self.digest = lccDigest(self.graph, self.lcc)
+        parameters = {"reduce": self.reduction is not None, "improve": improve,
+                      "parallelTrials": parallelTrials, "algorithm": algorithmParameters(name)}
+        return resultKey(self.digest, name, parameters, seed)
+
+
+# Print one result table per graph for the given algorithms, as the menu options do. The Own
+# Heuristic spreads its trials over every core; runs already in RESULTS are not repeated.
+def printTables(algorithms, label):
+    rValues = readRValues()
+    for i, graph in enumerate(GRAPHS):
+        print("For the graph: "+graph+" , below are the results for "+label)
+        if(i>=3):
+            print("\033[3mAs the graph is large, results are generating, please wait....\033[0m")
+        prepared = PreparedGraph(graph, rValues)
+        results = prepared.run(algorithms, seeds=(MENU_SEED,), cache=RESULTS,
+                               parallelTrials=["Own Heuristic"])
+        data = [prepared.row(name, lsp) for name, _, lsp, _, _ in results]
+        formatted_table = format_table(HEADERS, data)
+
         print()
         # Print the formatted table
         print(formatted_table)
         print()
 
+
+def dfslsp():
+    printTables(["DFS"], "DFS Algorithm")
+
+def dijkstra():
+    printTables(["Dijkstra"], "Dijkstra Algorithm")
+
 def astar():
-    graphs = ['graph_n300.edges', 'graph_n400.edges', 'graph_n500.edges']
-    extracted_values = {}
-    with open("graphs/n_rValues", 'r') as file:
-            for line in file:
-                components = line.strip().split()
-                extracted_values[int(components[0])] = float(components[1])
-                    
-    for i, graph in enumerate(graphs):
-        if(i<3):
-            g = Graph()
-            a = Astar()
-            
-            edges = g.readGraphFromFile(graph)
-            
-            lcc = g.findLCC()
-            
-            mD, aD = g.getlccdegrees(lcc)
-            
-            if(i<3):
-                r="{:.3f}".format(float(extracted_values.get(int(graph[graph.index("graph_n") + len("graph_n"):][:3]))))
-            else:
-                r="-"    
-                
-            if(i<3):
-                alsp = a.searchLSP(lcc,edges,g)
-            else:
-                alsp = "N/A"
-            
-            headers = ["Algorithm", "n", "r", "LCC Length", "Maximum Degree", "Average Degree", "LSP"]
-            data = [
-        ["A*", len(g.verticeSet), r, len(lcc), "{:.2f}".format(mD), "{:.2f}".format(aD), alsp]
-        ]        
-            formatted_table = format_table(headers, data)
-        
-            print("For the graph: "+graph+" , below are the results for each Algorithm")
-            print()
-            # Print the formatted table
-            print(formatted_table)
-            print()
+    printTables(["A*"], "A* Algorithm")
     
 def own():
-    graphs = ['graph_n300.edges', 'graph_n400.edges', 'graph_n500.edges', 'DSJC500-5.mtx', 'inf-euroroad.edges', 'inf-power.mtx']
-    extracted_values = {}
-    with open("graphs/n_rValues", 'r') as file:
-            for line in file:
-                components = line.strip().split()
-                extracted_values[int(components[0])] = float(components[1])
-                    
-    for i, graph in enumerate(graphs):
-        g = Graph()
-        o= OwnHeuristic()
-        print("For the graph: "+graph+" , below are the results for our Own Algorithm")    
-        if(i>=3):
-            print("\033[3mAs the graph is large, results are generating, please wait....\033[0m")    
-        edges = g.readGraphFromFile(graph)
-        lcc = g.findLCC()
-        olcc=g.findLCC(1)     
-        
-        mD, aD = g.getlccdegrees(lcc)
-        
-        if(i<3):
-            r="{:.3f}".format(float(extracted_values.get(int(graph[graph.index("graph_n") + len("graph_n"):][:3]))))
-        else:
-            r="-"
-                    
-        ownlsp = o.searchLSP(olcc,g)
-        
-        headers = ["Algorithm", "n", "r", "LCC Length", "Maximum Degree", "Average Degree", "LSP"]
-        data = [
-    ["Own Heuristic", len(g.verticeSet), r, len(lcc), "{:.2f}".format(mD), "{:.2f}".format(aD), ownlsp]
-    ]        
-        formatted_table = format_table(headers, data)
-    
-        print()
-        # Print the formatted table
-        print(formatted_table)
-        print()
+    printTables(["Own Heuristic"], "our Own Algorithm")
+
+def warnsdorff():
+    printTables(["Warnsdorff"], "Warnsdorff Algorithm")
     
 
 def format_table(headers, data):
@@ -372,67 +244,100 @@ def format_table(headers, data):
 
 
 def all():
-    graphs = ['graph_n300.edges', 'graph_n400.edges', 'graph_n500.edges', 'DSJC500-5.mtx', 'inf-euroroad.edges', 'inf-power.mtx']
-    extracted_values = {}
-    with open("graphs/n_rValues", 'r') as file:
-            for line in file:
-                components = line.strip().split()
-                extracted_values[int(components[0])] = float(components[1])
-                    
-    for i, graph in enumerate(graphs):
-        g = Graph()
-        d = DFS()
-        di = Dijkstra()
-        a = Astar()
-        o= OwnHeuristic()
-        print("For the graph: "+graph+" , below are the results for each Algorithm")
-        if(i>=3):
-            print("\033[3mAs the graph is large, results are generating, please wait....\033[0m")  
-        edges = g.readGraphFromFile(graph)
-        
-        lcc = g.findLCC()
-        dilcc = g.findLCC(1)
-        olcc=g.findLCC(1)     
-        
-        mD, aD = g.getlccdegrees(lcc)
-        
-        if(i<3):
-            r="{:.3f}".format(float(extracted_values.get(int(graph[graph.index("graph_n") + len("graph_n"):][:3]))))
-        else:
-            r="-"    
-            
-        dfslsp = d.searchLSP(lcc,g)
-        dilsp = di.searchLSP(g, random.choice(dilcc), dilcc)
-        if(i<3):
-            alsp = a.searchLSP(lcc,edges,g)
+    printTables(list(ALGORITHMS), "each Algorithm")
+
+
+# Non-interactive batch mode: every graph is loaded and preprocessed once, then all
+# (algorithm, seed) runs on it execute concurrently. Returns one result dict per run; with
+# stats=True each also carries the graph's preprocessing timers and the run's counters.
+def runBatch(graphs, algorithms, seeds, workers=None, progress=None, stats=False, reduce=False,
+             improve=None, cache=None, parallelTrials=()):
+    rValues = readRValues()
+    results = []
+    for graph in graphs:
+        prepared = PreparedGraph(graph, rValues, stats, reduce)
+        runs = prepared.run(algorithms, seeds, workers, improve, cache, parallelTrials)
+        for name, seed, lsp, elapsed, runStats in runs:
+            result = {"Graph": graph}
+            result.update(zip(HEADERS, prepared.row(name, lsp)))
+            result.update({"Seed": seed, "Seconds": round(elapsed, 4)})
+            if stats:
+                combined = Stats()
+                combined.merge(prepared.stats)
+                combined.merge(runStats)
+                result.update(combined.columns())
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return results
+
+
+def writeBatch(results, outputFormat, output=None):
+    columns = ["Graph"] + HEADERS + ["Seed", "Seconds"]
+    for result in results:
+        columns.extend(key for key in result if key not in columns)
+    out = open(output, 'w', newline='') if output else sys.stdout
+    try:
+        if outputFormat == "json":
+            json.dump(results, out, indent=2)
+            out.write("\n")
+        elif outputFormat == "csv":
+            writer = csv.DictWriter(out, fieldnames=columns, restval="")
+            writer.writeheader()
+            writer.writerows(results)
         else:
-            alsp = "N/A"
-        ownlsp = o.searchLSP(olcc,g)
-        
-        headers = ["Algorithm", "n", "r", "LCC Length", "Maximum Degree", "Average Degree", "LSP"]
-        data = [
-    ["DFS", len(g.verticeSet), r, len(lcc), "{:.2f}".format(mD), "{:.2f}".format(aD), dfslsp],
-    ["Dijkstra", len(g.verticeSet), r, len(lcc), "{:.2f}".format(mD), "{:.2f}".format(aD), len(dilsp)],
-    ["A*", len(g.verticeSet), r, len(lcc), "{:.2f}".format(mD), "{:.2f}".format(aD), alsp],
-    ["Own Heuristic", len(g.verticeSet), r, len(lcc), "{:.2f}".format(mD), "{:.2f}".format(aD), ownlsp]
-    ]        
-        formatted_table = format_table(headers, data)
-    
-        
-        print()
-        # Print the formatted table
-        print(formatted_table)
-        print()
-        
+            out.write(format_table(columns, [[result.get(c, "") for c in columns] for result in results]) + "\n")
+    finally:
+        if output:
+            out.close()
+
+
+def batchMain(argv):
+    parser = argparse.ArgumentParser(description="Longest simple path search without the menu")
+    parser.add_argument("--graphs", nargs="+", default=GRAPHS, help="files in graphs/")
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS),
+                        choices=list(ALGORITHMS) + list(EXTRA_ALGORITHMS))
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0])
+    parser.add_argument("--workers", type=int, default=None, help="defaults to all cores")
+    parser.add_argument("--format", choices=["table", "csv", "json"], default=None,
+                        help="defaults to the output file extension, or table on stdout")
+    parser.add_argument("--output", default=None, help="defaults to stdout")
+    parser.add_argument("--stats", action="store_true",
+                        help="add per-phase timers and search counters to every row")
+    parser.add_argument("--reduce", action="store_true",
+                        help="search the LCC after leaf pruning and degree-2 chain contraction")
+    parser.add_argument("--improve", type=float, default=None, metavar="SECONDS",
+                        help="lengthen every path by rotation/extension local search for up to SECONDS")
+    parser.add_argument("--parallel-trials", nargs="+", default=[], choices=list(PARALLEL_ALGORITHMS),
+                        help="run these algorithms one at a time, spreading their trials over the workers")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="rerun every search instead of reusing stored results (and their Seconds)")
+    args = parser.parse_args(argv)
+
+    outputFormat = args.format
+    if outputFormat is None:
+        outputFormat = "table"
+        if args.output and args.output.endswith((".csv", ".json")):
+            outputFormat = args.output.rsplit(".", 1)[1]
+    results = runBatch(args.graphs, args.algorithms, args.seeds, args.workers, stats=args.stats,
+                       reduce=args.reduce, improve=args.improve,
+                       cache=None if args.no_cache else RESULTS, parallelTrials=args.parallel_trials)
+    writeBatch(results, outputFormat, args.output)
+
     
 def main():
+    if len(sys.argv) > 1:
+        batchMain(sys.argv[1:])
+        return
+
     options = {
         1: generate,
         2: dfslsp,
         3: dijkstra,
         4: astar,
         5: own,
-        6: all
+        6: all,
+        8: warnsdorff
     }
 
     while True:
@@ -444,6 +349,7 @@ def main():
         print("5. Own Heuristic LSP Search")
         print("6. Execute all Graphs")
         print("7. Exit")
+        print("8. Warnsdorff LSP Search")
         print("\033[3mPlease note that generating results for online graphs requires some time as the graphs are large in nature.\033[0m")
 
         
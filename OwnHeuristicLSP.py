@@ -1,40 +1,149 @@
-import random
-from collections import defaultdict
+from array import array
+
+from anytime import CHARGE_EVERY, Budget
+from instrumentation import current
+
+from parallelTrials import runTrials
+from trialScheduler import TrialScheduler
 
 class OwnHeuristic:
     def searchLSP(self, connected_comp, graph_obj):
-        
-        path_max = 0
-        num_attempts = int(len(connected_comp) ** 0.5)  
-        path_records = {}  
-        for _ in range(num_attempts):
-            pivot_point = random.choice(connected_comp)
-            path_extent = self.findLongestFromNode(pivot_point, graph_obj, path_records)
-            path_max = max(path_max, path_extent)
-        return path_max
+        return self.searchLSPPath(connected_comp, graph_obj)[0]
+
+    # Run the sqrt(n) trials on a process pool over a shared-memory copy of the graph.
+    # Returns (longest length, path of dense indices that achieved it).
+    def searchLSPParallel(self, connected_comp, graph_obj, workers=None, seed=0):
+        trials = int(len(connected_comp) ** 0.5)
+        return runTrials(graph_obj, connected_comp, "own", trials, workers, seed)
+
+    # Split the component into biconnected blocks, run this heuristic on every block (large
+    # blocks of one block-cut tree level in parallel) and join the block paths by DP over the
+    # tree. Returns (longest length, path of dense indices).
+    def searchLSPBlocks(self, connected_comp, graph_obj, workers=None, seed=0):
+        from blockCutTree import searchBlockTree
+        return searchBlockTree(graph_obj, connected_comp, workers, seed)
+
+    # Up to sqrt(n) trials from TrialScheduler starts sharing path_records, stopping once they
+    # no longer improve; returns the best (length, path of dense indices)
+    def searchLSPPath(self, connected_comp, graph_obj):
+        best = (0, [])
+        path_records = {}
+        scheduler = TrialScheduler(graph_obj, connected_comp)
+        for pivot_point in scheduler:
+            found = self.findLongestPathFromNode(pivot_point, graph_obj, path_records)
+            if found[0] > best[0]:
+                best = found
+            scheduler.record(*found)
+        return best
+
+    # The scheduled trials sharing path_records; the budget is also checked inside the
+    # backtracking, so a single long trial can be cut short
+    def searchAnytime(self, g, component, budget=None, trials=None):
+        budget = budget or Budget()
+        budget.start()
+        path_records = {}
+        scheduler = TrialScheduler(g, component, trials)
+        for pivot_point in scheduler:
+            scheduler.record(*self.findLongestPathFromNode(pivot_point, g, path_records, budget))
+            if budget.exhausted():
+                break
+        return budget.result()
 
     def findLongestFromNode(self, init_point, network, path_records):
-        
-        exploration_stack = [(init_point, set([init_point.node]), 0)]  
+        return self.findLongestPathFromNode(init_point, network, path_records)[0]
+
+    # Iterative backtracking over a CSRGraph with one visited bitmap: entering a vertex marks
+    # it and appends it to the path, leaving undoes both, so memory stays O(V) however many
+    # branches are open. A vertex is only entered when it is reached with a longer path than
+    # path_records holds for it. Neighbors are tried in order of increasing degree, which
+    # reaches long paths, and therefore strong records, early. Lengths, and the records, are
+    # weighted when the network carries edge weights.
+    # Returns (length, path of dense indices) of the longest dead-end path found.
+    def findLongestPathFromNode(self, init_point, network, path_records, budget=None):
+        start = getattr(init_point, 'node', init_point)
+        offsets = network.offsets
+        ordered = self.degreeOrderedNeighbors(network)
+        orderedWeights = self.orderedWeights
+        visited = bytearray(network.numVertices())
+
+        if start in path_records and path_records[start] >= 0:
+            return 0, [start]
+        path_records[start] = 0
+        visited[start] = 1
+        path = [start]
+        lengths = [0]
+        positions = [offsets[start]]
         optimal_length = 0
+        optimal_path = [start]
+        extended = [False]
+        ticks = 0
+        entered = 1
+        pruned = 0
+
+        while path:
+            v = path[-1]
+            position = positions[-1]
+            end = offsets[v + 1]
+            while position < end and visited[ordered[position]]:
+                position += 1
+
+            if position == end:
+                # Dead end when no neighbor was unvisited on arrival; then undo this vertex
+                if not extended[-1] and lengths[-1] > optimal_length:
+                    optimal_length = lengths[-1]
+                    optimal_path = list(path)
+                    if budget is not None:
+                        budget.offer(optimal_length, optimal_path)
+                visited[v] = 0
+                path.pop()
+                lengths.pop()
+                positions.pop()
+                extended.pop()
+                continue
+
+            positions[-1] = position + 1
+            extended[-1] = True
+            w = ordered[position]
+            path_len = lengths[-1] + (1 if orderedWeights is None else orderedWeights[position])
+            if w in path_records and path_records[w] >= path_len:
+                pruned += 1
+                continue
+            path_records[w] = path_len
+            if budget is not None:
+                ticks += 1
+                if ticks == CHARGE_EVERY:
+                    ticks = 0
+                    if budget.charge(CHARGE_EVERY):
+                        break
+            visited[w] = 1
+            path.append(w)
+            lengths.append(path_len)
+            positions.append(offsets[w])
+            extended.append(False)
+            entered += 1
+
+        stats = current()
+        if stats is not None:
+            stats.count("verticesEntered", entered)
+            stats.count("prunedBranches", pruned)
+        return optimal_length, optimal_path
 
-        while exploration_stack:
-            active_vertex, seen_nodes, path_len = exploration_stack.pop()
-            
-            if active_vertex.node in path_records and path_records[active_vertex.node] >= path_len:
-                continue  
-
-            path_records[active_vertex.node] = path_len
-
-            
-            potential_next = [n for n in network.adjList[active_vertex.node] if n not in seen_nodes]
-            if not potential_next:
-                optimal_length = max(optimal_length, path_len)  
-            else:
-                for next_node in potential_next:
-                    next_vertex = network.verticeMap[next_node]
-                    new_seen = set(seen_nodes)  
-                    new_seen.add(next_node)
-                    exploration_stack.append((next_vertex, new_seen, path_len + 1))
-
-        return optimal_length
+    # CSR neighbor rows sorted by ascending neighbor degree, built once per graph, with the
+    # matching edge weights in self.orderedWeights (None for unit edges)
+    def degreeOrderedNeighbors(self, network):
+        if getattr(self, 'orderedFor', None) is not network:
+            offsets = network.offsets
+            neighbors = network.neighbors
+            weights = network.weights
+            ordered = array('i')
+            orderedWeights = None if weights is None else array('i')
+            for v in range(network.numVertices()):
+                row = sorted(range(offsets[v], offsets[v + 1]),
+                             key=lambda k: offsets[neighbors[k] + 1] - offsets[neighbors[k]])
+                ordered.extend(neighbors[k] for k in row)
+                if weights is not None:
+                    orderedWeights.extend(weights[k] for k in row)
+            self.orderedFor = network
+            self.ordered = ordered
+            self.orderedWeights = orderedWeights
+        return self.ordered
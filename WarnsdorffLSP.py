@@ -0,0 +1,131 @@
+import random
+from array import array
+
+from anytime import CHARGE_EVERY, Budget
+from instrumentation import current
+from trialScheduler import TrialScheduler
+
+class Warnsdorff:
+
+    # discrepancies: how many times one path may step to a neighbor other than the greedy
+    # choice; stepFactor: vertices entered per start, as a multiple of the component size
+    def __init__(self, discrepancies=1, stepFactor=4):
+        self.discrepancies = discrepancies
+        self.stepFactor = stepFactor
+
+    def searchLSP(self, component, g):
+        return self.searchLSPPath(component, g)[0]
+
+    # Warnsdorff paths from scheduled starts, lowest degree first, since a path that starts
+    # at a vertex with few neighbors wastes the fewest of them.
+    # Returns the best (length, path of dense indices).
+    def searchLSPPath(self, component, g, budget=None, trials=None):
+        offsets = g.offsets
+        order = sorted((getattr(v, 'node', v) for v in component),
+                       key=lambda v: (offsets[v + 1] - offsets[v], random.random()))
+        scheduler = TrialScheduler(g, component, trials, order=order)
+        best = (0, [order[0]] if order else [])
+        for start in scheduler:
+            found = self.buildPath(start, g, len(order), budget)
+            if found[0] > best[0]:
+                best = found
+            scheduler.record(*found)
+            if (budget is not None and budget.exhausted()) or \
+                    (g.weights is None and len(best[1]) == len(order)):
+                break
+        return best
+
+    # The scheduled starts, with the budget also checked while a path is being built
+    def searchAnytime(self, g, component, budget=None, trials=None):
+        budget = budget or Budget()
+        budget.start()
+        self.searchLSPPath(component, g, budget, trials)
+        return budget.result()
+
+    # Grow a simple path from start, always stepping to the unvisited neighbor with the fewest
+    # unvisited neighbors of its own, except that a neighbor with none left, which would end
+    # the path, comes last. residual[v] holds that count for every vertex and is
+    # updated as vertices are entered and left. At a dead end the search backtracks, allowing
+    # up to self.discrepancies non-greedy steps per path (limited discrepancy search), until
+    # stepFactor * size vertices have been entered. Lengths are weighted when g has weights.
+    # Returns (length, path of dense indices) of the longest path found.
+    def buildPath(self, start, g, size, budget=None):
+        offsets = g.offsets
+        neighbors = g.neighbors
+        weights = g.weights
+        n = g.numVertices()
+        residual = array('i', (offsets[v + 1] - offsets[v] for v in range(n)))
+        visited = bytearray(n)
+        limit = self.stepFactor * size
+        allowed = self.discrepancies
+
+        # Mark v as on the path and return its unvisited neighbors in greedy order, as
+        # (neighbor, edge weight) pairs, cut to the choices the remaining discrepancies allow
+        def enter(v, spent):
+            visited[v] = 1
+            row = range(offsets[v], offsets[v + 1])
+            for k in row:
+                residual[neighbors[k]] -= 1
+            choices = sorted((k for k in row if not visited[neighbors[k]]),
+                             key=lambda k: (residual[neighbors[k]] == 0, residual[neighbors[k]]))
+            return [(neighbors[k], 1 if weights is None else weights[k])
+                    for k in choices[:allowed - spent + 1]]
+
+        path = [start]
+        lengths = [0]
+        spent = [0]
+        choices = [enter(start, 0)]
+        nextChoice = [0]
+        best_length = 0
+        best_path = [start]
+        entered = 1
+        ticks = 0
+        while path:
+            i = nextChoice[-1]
+            options = choices[-1]
+            cost = spent[-1] + (i > 0)
+            if i == len(options) or cost > allowed or entered >= limit:
+                if not options and lengths[-1] > best_length:
+                    best_length = lengths[-1]
+                    best_path = list(path)
+                    if budget is not None:
+                        budget.offer(best_length, best_path)
+                if entered >= limit or (weights is None and len(best_path) == size):
+                    # Out of steps, or the path is Hamiltonian and cannot get longer
+                    break
+                v = path.pop()
+                visited[v] = 0
+                for w in neighbors[offsets[v]:offsets[v + 1]]:
+                    residual[w] += 1
+                lengths.pop()
+                spent.pop()
+                choices.pop()
+                nextChoice.pop()
+                continue
+
+            nextChoice[-1] = i + 1
+            w, step = options[i]
+            path.append(w)
+            lengths.append(lengths[-1] + step)
+            spent.append(cost)
+            choices.append(enter(w, cost))
+            nextChoice.append(0)
+            entered += 1
+            if budget is not None:
+                ticks += 1
+                if ticks == CHARGE_EVERY:
+                    ticks = 0
+                    if budget.charge(CHARGE_EVERY):
+                        break
+
+        if path and lengths[-1] > best_length:
+            # Cut short by the step limit or the budget: the open path is simple too
+            best_length = lengths[-1]
+            best_path = list(path)
+            if budget is not None:
+                budget.offer(best_length, best_path)
+
+        stats = current()
+        if stats is not None:
+            stats.count("verticesEntered", entered)
+        return best_length, best_path
@@ -0,0 +1,120 @@
+import random
+
+from AStarLSP import Astar
+from blockCutTree import BlockOwnHeuristic
+from DFSLSP import DFS
+from DijkstraLSP import Dijkstra
+from instrumentation import phase
+from OwnHeuristicLSP import OwnHeuristic
+from WarnsdorffLSP import Warnsdorff
+
+
+# Each runner takes a CSRGraph, and optionally its already computed LCC, and returns the
+# LSP value reported in the Driver tables, counted in edges like every other mode
+def runDFS(g, lcc=None):
+    return DFS().searchLSP(g.findLCC() if lcc is None else lcc, g)
+
+
+def runDijkstra(g, lcc=None):
+    lcc = g.findLCC() if lcc is None else lcc
+    return len(Dijkstra().searchLSP(g, random.choice(lcc), lcc)) - 1
+
+
+def runAstar(g, lcc=None):
+    return Astar().searchLSP(g.findLCC() if lcc is None else lcc, g)
+
+
+def runOwnHeuristic(g, lcc=None):
+    return OwnHeuristic().searchLSP(g.findLCC() if lcc is None else lcc, g)
+
+
+def runWarnsdorff(g, lcc=None):
+    return Warnsdorff().searchLSP(g.findLCC() if lcc is None else lcc, g)
+
+
+def runOwnHeuristicBlocks(g, lcc=None):
+    return BlockOwnHeuristic().searchLSP(g.findLCC() if lcc is None else lcc, g)
+
+
+ALGORITHMS = {
+    "DFS": runDFS,
+    "Dijkstra": runDijkstra,
+    "A*": runAstar,
+    "Own Heuristic": runOwnHeuristic,
+    "Warnsdorff": runWarnsdorff,
+}
+
+
+# Runners kept out of the default tables: selectable by name, but on the power-grid and road
+# graphs the block decomposition is still slower than the plain Own Heuristic and finds
+# shorter paths
+EXTRA_ALGORITHMS = {
+    "Own Heuristic Blocks": runOwnHeuristicBlocks,
+}
+
+
+# Runners whose random trials are themselves spread over a process pool; each takes
+# (g, lcc, workers, seed) and returns (LSP, path of dense indices)
+def runDFSParallel(g, lcc, workers=None, seed=0):
+    return DFS().searchLSPParallel(lcc, g, workers, seed)
+
+
+def runOwnHeuristicParallel(g, lcc, workers=None, seed=0):
+    return OwnHeuristic().searchLSPParallel(lcc, g, workers, seed)
+
+
+def runOwnHeuristicBlocksParallel(g, lcc, workers=None, seed=0):
+    return OwnHeuristic().searchLSPBlocks(lcc, g, workers, seed)
+
+
+PARALLEL_ALGORITHMS = {
+    "DFS": runDFSParallel,
+    "Own Heuristic": runOwnHeuristicParallel,
+    "Own Heuristic Blocks": runOwnHeuristicBlocksParallel,
+}
+
+
+# Classes exposing the shared searchAnytime(g, component, budget) interface
+CLASSES = {
+    "DFS": DFS,
+    "Dijkstra": Dijkstra,
+    "A*": Astar,
+    "Own Heuristic": OwnHeuristic,
+    "Warnsdorff": Warnsdorff,
+    "Own Heuristic Blocks": BlockOwnHeuristic,
+}
+
+
+# Path (dense indices) found by the algorithm's anytime search with an unlimited budget; also
+# works on weighted graphs such as graphReduction's, where the LSP values above do not apply
+def searchPath(name, g, lcc=None):
+    lcc = g.findLCC() if lcc is None else lcc
+    with phase("search"):
+        return CLASSES[name]().searchAnytime(g, lcc).path
+
+
+def runAlgorithm(name, g, lcc=None):
+    runner = ALGORITHMS.get(name, EXTRA_ALGORITHMS.get(name))
+    if runner is None:
+        raise ValueError(f"Unknown algorithm {name!r}, expected one of: " +
+                         ", ".join(list(ALGORITHMS) + list(EXTRA_ALGORITHMS)))
+    with phase("search"):
+        return runner(g, lcc)
+
+
+# Constructor settings that change each algorithm's results; with the LCC and seed they
+# identify a stored result
+SETTINGS = {
+    "DFS": (),
+    "Dijkstra": (),
+    "A*": ("landmarks",),
+    "Own Heuristic": (),
+    "Warnsdorff": ("discrepancies", "stepFactor"),
+    "Own Heuristic Blocks": (),
+}
+
+
+# (class name, ((setting, value), ...)) of an algorithm as run by its default runner
+def algorithmParameters(name):
+    algorithm = CLASSES[name]()
+    return CLASSES[name].__name__, tuple((key, getattr(algorithm, key)) for key in SETTINGS[name])
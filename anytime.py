@@ -0,0 +1,82 @@
+import time
+
+
+class LSPResult:
+    # length counts edges on path; complete is False when the budget stopped the search early
+    def __init__(self, length, path, expansions, elapsed, complete):
+        self.length = length
+        self.path = path
+        self.expansions = expansions
+        self.elapsed = elapsed
+        self.complete = complete
+
+    def asDict(self):
+        return {
+            "length": self.length,
+            "path": list(self.path),
+            "expansions": self.expansions,
+            "elapsed": self.elapsed,
+            "complete": self.complete,
+        }
+
+
+# Every LSP class provides searchAnytime(g, component, budget=None, ...). It calls
+# budget.start(), offers each longer path it finds, stops once charge() reports the budget
+# spent, and returns budget.result(). Without a budget the search runs to completion.
+class Budget:
+    # Wall-clock and/or node-expansion limit shared by every searchAnytime. Searches call
+    # charge() every few hundred expansions and offer() whenever they find a longer path;
+    # callback(length, path, elapsed, expansions) is invoked at most once per interval
+    # with the best path so far, and once more when the search finishes.
+    def __init__(self, seconds=None, expansions=None, callback=None, interval=0.5):
+        self.seconds = seconds
+        self.maxExpansions = expansions
+        self.callback = callback
+        self.interval = interval
+        self.start()
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.lastReport = self.started
+        self.expansions = 0
+        self.bestLength = -1
+        self.bestPath = []
+        self.stopped = False
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    # Count expansions and report whether the search must stop now
+    def charge(self, count=1):
+        self.expansions += count
+        if self.maxExpansions is not None and self.expansions >= self.maxExpansions:
+            self.stopped = True
+        if self.seconds is not None or self.callback is not None:
+            now = time.perf_counter()
+            if self.seconds is not None and now - self.started >= self.seconds:
+                self.stopped = True
+            if self.callback is not None and now - self.lastReport >= self.interval:
+                self.lastReport = now
+                self.report()
+        return self.stopped
+
+    def exhausted(self):
+        return self.stopped
+
+    def offer(self, length, path):
+        if length > self.bestLength:
+            self.bestLength = length
+            self.bestPath = list(path)
+
+    def report(self):
+        if self.callback is not None and self.bestLength >= 0:
+            self.callback(self.bestLength, self.bestPath, self.elapsed(), self.expansions)
+
+    def result(self):
+        self.report()
+        return LSPResult(max(self.bestLength, 0), self.bestPath, self.expansions,
+                         self.elapsed(), not self.stopped)
+
+
+# Tick interval between Budget.charge calls inside the search loops
+CHARGE_EVERY = 256
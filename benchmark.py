@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from algorithms import CLASSES
+from anytime import Budget
+from graphLoader import GRAPH_DIR, loadGraph
+from instrumentation import collecting
+
+GRAPH_EXTENSIONS = (".edges", ".mtx")
+
+
+def discoverGraphs():
+    return sorted(name for name in os.listdir(GRAPH_DIR) if name.endswith(GRAPH_EXTENSIONS))
+
+
+# Preprocessing phases of one graph, in order; each returns (nodes expanded, LSP length),
+# which are None for phases without such a notion
+def graphPhases(graphName, state):
+    def load():
+        state["graph"] = loadGraph(graphName, cache=False)
+        return None, None
+
+    def loadCached():
+        loadGraph(graphName)
+        return None, None
+
+    def lcc():
+        state["lcc"] = state["graph"].components().lcc
+        return None, None
+
+    def degrees():
+        state["graph"].lccDegreeStats()
+        return None, None
+
+    return [("load", load), ("load (cached)", loadCached), ("lcc", lcc), ("degrees", degrees)]
+
+
+# Nodes expanded are the search's own verticesPopped/verticesEntered counters, since
+# Budget.expansions only counts what a search charges, in blocks
+def searchPhase(algorithm, state, seed):
+    def search():
+        random.seed(seed)
+        with collecting() as stats:
+            result = CLASSES[algorithm]().searchAnytime(state["graph"], state["lcc"], Budget())
+        counters = stats.counters
+        return counters.get("verticesPopped", 0) + counters.get("verticesEntered", 0), result.length
+    return [("search", search)]
+
+
+# Time every phase `repeat` times after `warmup` untimed rounds, then run once more under
+# tracemalloc for peak memory so allocation tracing never distorts the timings
+def measure(graphName, algorithm, makePhases, warmup, repeat):
+    timings = {}
+    expansions = {}
+    lengths = {}
+    for round in range(warmup + repeat):
+        for name, phase in makePhases():
+            started = time.perf_counter()
+            expanded, length = phase()
+            elapsed = time.perf_counter() - started
+            if round >= warmup:
+                timings.setdefault(name, []).append(elapsed)
+                expansions[name] = expanded
+                lengths[name] = length
+
+    peaks = {}
+    for name, phase in makePhases():
+        tracemalloc.start()
+        phase()
+        peaks[name] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    records = []
+    for name, samples in timings.items():
+        records.append({
+            "graph": graphName,
+            "algorithm": algorithm,
+            "phase": name,
+            "wall": {
+                "min": min(samples),
+                "median": statistics.median(samples),
+                "mean": statistics.fmean(samples),
+            },
+            "expansions": expansions[name],
+            "peakMemory": peaks[name],
+            "lsp": lengths[name],
+        })
+    return records
+
+
+def runBenchmarks(graphs, algorithms, seed=0, warmup=1, repeat=3, progress=None):
+    records = []
+    for graphName in graphs:
+        state = {}
+        measured = [measure(graphName, "-", lambda: graphPhases(graphName, state), warmup, repeat)]
+        for algorithm in algorithms:
+            measured.append(measure(graphName, algorithm,
+                                    lambda: searchPhase(algorithm, state, seed), warmup, repeat))
+        for group in measured:
+            records.extend(group)
+            if progress is not None:
+                progress(group)
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": seed,
+            "warmup": warmup,
+            "repeat": repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": records,
+    }
+
+
+def recordKey(record):
+    return record["graph"], record["algorithm"], record["phase"]
+
+
+# Records whose median wall time grew by more than `threshold` (0.2 = 20%) over the baseline.
+# Phases shorter than `floor` seconds in both runs are ignored as timer noise.
+def compareToBaseline(report, baseline, threshold=0.2, floor=0.001):
+    previous = {recordKey(record): record for record in baseline["results"]}
+    regressions = []
+    for record in report["results"]:
+        old = previous.get(recordKey(record))
+        if old is None:
+            continue
+        before = old["wall"]["median"]
+        after = record["wall"]["median"]
+        if max(before, after) < floor:
+            continue
+        if after > before * (1 + threshold):
+            regressions.append((record, before, after))
+    return regressions
+
+
+def printRecords(records):
+    for record in records:
+        print(f"{record['graph']:<20} {record['algorithm']:<14} {record['phase']:<14} "
+              f"{record['wall']['median'] * 1000:>10.2f} ms "
+              f"{record['peakMemory'] / 1024:>10.1f} KiB "
+              f"{'' if record['expansions'] is None else record['expansions']:>10} "
+              f"{'' if record['lsp'] is None else record['lsp']:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every LSP algorithm on every graph")
+    parser.add_argument("--graphs", nargs="+", default=None, help="defaults to every file in graphs/")
+    parser.add_argument("--algorithms", nargs="+", default=list(CLASSES), choices=list(CLASSES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--baseline", default=None, help="earlier --output file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slowdown of the median that counts as a regression")
+    args = parser.parse_args()
+
+    print(f"{'graph':<20} {'algorithm':<14} {'phase':<14} {'median':>13} {'peak':>14} "
+          f"{'expanded':>10} {'lsp':>6}")
+    report = runBenchmarks(args.graphs or discoverGraphs(), args.algorithms,
+                           args.seed, args.warmup, args.repeat, printRecords)
+    with open(args.output, 'w') as out:
+        json.dump(report, out, indent=2)
+    print("Results written to " + args.output)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            baseline = json.load(file)
+        regressions = compareToBaseline(report, baseline, args.threshold)
+        for record, before, after in regressions:
+            print(f"REGRESSION {record['graph']} {record['algorithm']} {record['phase']}: "
+                  f"{before * 1000:.2f} ms -> {after * 1000:.2f} ms")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against " + args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+import os
+import random
+from array import array
+from multiprocessing import Pool
+
+from anytime import Budget
+from csrGraph import CSRGraph, csrArrays
+from instrumentation import current
+from parallelTrials import trialSeed
+
+# Blocks with at least this many vertices are sent to the worker pool; smaller ones are
+# solved in the parent, where the pickling would cost more than the search
+PARALLEL_MIN = 64
+
+
+class BlockCutTree:
+    # Biconnected blocks of a connected component, found with an iterative Hopcroft-Tarjan
+    # pass. blocks[b] lists the edges of block b as (u, v) dense-index pairs; a vertex that
+    # lies in more than one block is an articulation point. The tree is rooted at the
+    # largest block: parentCut[b] is the articulation point joining block b to its parent
+    # block (-1 for the root) and depth[b] its distance from the root in blocks.
+    def __init__(self, g, component):
+        self.blocks = biconnectedBlocks(g, component)
+        self.vertices = [sorted(set(u for edge in edges for u in edge)) for edges in self.blocks]
+        blocksOf = {}
+        for b, vertices in enumerate(self.vertices):
+            for v in vertices:
+                blocksOf.setdefault(v, []).append(b)
+        self.cuts = {v: blocks for v, blocks in blocksOf.items() if len(blocks) > 1}
+
+        count = len(self.blocks)
+        self.parentCut = array('i', [-1]) * count
+        self.depth = array('i', [-1]) * count
+        self.children = [[] for _ in range(count)]
+        if not count:
+            self.root = -1
+            return
+        self.root = max(range(count), key=lambda b: len(self.vertices[b]))
+        self.depth[self.root] = 0
+        queue = [self.root]
+        for b in queue:
+            for c in self.vertices[b]:
+                if c == self.parentCut[b] or c not in self.cuts:
+                    continue
+                for child in self.cuts[c]:
+                    if self.depth[child] == -1:
+                        self.depth[child] = self.depth[b] + 1
+                        self.parentCut[child] = c
+                        self.children[b].append(child)
+                        queue.append(child)
+
+    # Child articulation points of block b: its cut vertices other than the parent one
+    def childCuts(self, b):
+        return [c for c in self.vertices[b] if c in self.cuts and c != self.parentCut[b]]
+
+
+# Edge lists of the biconnected blocks of the component containing component[0]. Uses an
+# explicit stack of (vertex, parent, next neighbor position) frames instead of recursion.
+def biconnectedBlocks(g, component):
+    offsets = g.offsets
+    neighbors = g.neighbors
+    members = [getattr(v, 'node', v) for v in component]
+    if not members:
+        return []
+    n = g.numVertices()
+    disc = array('i', [-1]) * n
+    low = array('i', bytes(4 * n))
+    root = members[0]
+    disc[root] = low[root] = 0
+    clock = 1
+    frames = [[root, -1, offsets[root]]]
+    edges = []
+    blocks = []
+    while frames:
+        frame = frames[-1]
+        v, parent, position = frame
+        if position < offsets[v + 1]:
+            frame[2] = position + 1
+            w = neighbors[position]
+            if disc[w] == -1:
+                edges.append((v, w))
+                disc[w] = low[w] = clock
+                clock += 1
+                frames.append([w, v, offsets[w]])
+            elif w != parent and disc[w] < disc[v]:
+                edges.append((v, w))
+                if disc[w] < low[v]:
+                    low[v] = disc[w]
+            continue
+
+        frames.pop()
+        if parent == -1:
+            continue
+        if low[v] < low[parent]:
+            low[parent] = low[v]
+        if low[v] >= disc[parent]:
+            # parent separates v's subtree: the edges pushed since (parent, v) form a block
+            block = []
+            while True:
+                edge = edges.pop()
+                block.append(edge)
+                if edge == (parent, v):
+                    break
+            blocks.append(block)
+    return blocks
+
+
+# Local CSR graph of one block, plus one pendant vertex per (local vertex, length) in
+# pendants joined by an edge of that length. Returns (offsets, neighbors, weights or None).
+def blockArrays(vertices, edges, pendants):
+    local = {v: i for i, v in enumerate(vertices)}
+    pairs = [(local[u], local[v], 1) for u, v in edges]
+    k = len(vertices)
+    for i, length in pendants:
+        pairs.append((i, k, length))
+        k += 1
+    weights = [length for _, _, length in pairs] if pendants else None
+    return csrArrays(k, [a for a, _, _ in pairs], [b for _, b, _ in pairs], weights)
+
+
+# Solve one block graph with OwnHeuristic: the longest path found from start (skipped when
+# start is -1), the longest found anywhere, each as (length, local path), and the search's
+# instrumentation counters as a Stats dict. The free search starts from the longest
+# pendants, where the best paths tend to end, and from sqrt(k) random vertices, all sharing
+# one path_records table.
+def solveBlock(task):
+    import random
+    from instrumentation import collecting
+    from OwnHeuristicLSP import OwnHeuristic
+    offsets, neighbors, weights, start, pendants, seed = task
+    rng = random.Random(seed)
+    k = len(offsets) - 1
+    graph = CSRGraph(array('q', range(k)), offsets, neighbors, weights=weights)
+    own = OwnHeuristic()
+    path_records = {}
+    with collecting() as stats:
+        fixed = own.findLongestPathFromNode(start, graph, path_records) if start >= 0 else (-1, [])
+        free = fixed
+        trials = int(k ** 0.5)
+        starts = pendants[:trials] + [rng.randrange(k) for _ in range(trials)]
+        for s in starts:
+            found = own.findLongestPathFromNode(s, graph, path_records)
+            if found[0] > free[0]:
+                free = found
+    return fixed, free, stats.asDict()
+
+
+class BlockTreeSearch:
+    # Divide-and-conquer longest path over the block-cut tree. A simple path visits the blocks
+    # along one path of the tree and crosses each block once, so blocks are solved bottom-up,
+    # one tree level at a time and the levels' blocks in parallel:
+    #  - down[c] is the longest path found from articulation point c into its child blocks;
+    #    every block sees each child articulation point as a pendant edge of that length.
+    #  - A block's path from its parent articulation point gives that point's down value.
+    #  - Its free path is a candidate for paths whose highest block it is, and two down paths
+    #    through different child blocks of one articulation point are candidates through it.
+    # A budget is charged with the vertices each block search entered and checked after every
+    # block; once it is spent the paths joined so far are the result.
+    def __init__(self, g, component, workers=None, seed=0, budget=None):
+        self.g = g
+        self.tree = BlockCutTree(g, component)
+        self.workers = workers
+        self.seed = seed
+        self.budget = budget
+        self.down = {}
+        self.ways = {}
+        self.best = (0, [getattr(component[0], 'node', component[0])] if component else [])
+
+    # Original vertices of the down path below articulation point c, c itself excluded
+    def liftDown(self, c):
+        path = []
+        while c in self.down:
+            _, segment, c = self.down[c]
+            path.extend(segment)
+        return path
+
+    # Original vertices of a local block path; pendants expand to their down paths
+    def liftLocal(self, vertices, pendantOf, localPath):
+        k = len(vertices)
+        path = []
+        for position, i in enumerate(localPath):
+            if i < k:
+                path.append(vertices[i])
+            elif position == 0:
+                path.extend(reversed(self.liftDown(pendantOf[i])))
+            else:
+                path.extend(self.liftDown(pendantOf[i]))
+        return path
+
+    def offer(self, length, path):
+        if length > self.best[0]:
+            self.best = (length, path)
+            if self.budget is not None:
+                self.budget.offer(length, path)
+
+    def search(self):
+        tree = self.tree
+        if tree.root == -1:
+            return self.best
+        levels = {}
+        for b in range(len(tree.blocks)):
+            levels.setdefault(tree.depth[b], []).append(b)
+
+        pool = None
+        try:
+            for level in sorted(levels, reverse=True):
+                jobs = []
+                for b in levels[level]:
+                    vertices = tree.vertices[b]
+                    local = {v: i for i, v in enumerate(vertices)}
+                    pendants = [(local[c], self.down[c][0]) for c in tree.childCuts(b) if c in self.down]
+                    pendantOf = {len(vertices) + j: vertices[i] for j, (i, _) in enumerate(pendants)}
+                    start = local[tree.parentCut[b]] if tree.parentCut[b] >= 0 else -1
+                    longest = sorted(pendantOf, key=lambda p: self.down[pendantOf[p]][0], reverse=True)
+                    task = blockArrays(vertices, tree.blocks[b], pendants) + \
+                        (start, longest, trialSeed(self.seed, b))
+                    jobs.append((b, vertices, pendantOf, task))
+
+                large = [job for job in jobs if len(job[1]) >= PARALLEL_MIN]
+                if len(large) > 1 and pool is None and self.workers != 1:
+                    pool = Pool(processes=self.workers or os.cpu_count())
+                if pool is not None and len(large) > 1:
+                    solved = dict(zip((job[0] for job in large),
+                                      pool.map(solveBlock, [job[3] for job in large], chunksize=1)))
+                else:
+                    solved = {}
+                stopped = False
+                for b, vertices, pendantOf, task in jobs:
+                    fixed, free, blockStats = solved[b] if b in solved else solveBlock(task)
+                    self.collect(b, vertices, pendantOf, fixed, free)
+                    if self.charge(blockStats):
+                        stopped = True
+                        break
+                self.finishLevel()
+                if stopped:
+                    break
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        return self.best
+
+    # Hand one block search's counters to the active Stats and the budget; True once the
+    # budget is spent
+    def charge(self, blockStats):
+        stats = current()
+        if stats is not None:
+            stats.merge(blockStats)
+        if self.budget is None:
+            return False
+        return self.budget.charge(blockStats["counters"].get("verticesEntered", 0))
+
+    # Record block b's free path as a candidate and its path from the parent articulation
+    # point as one way down from that point
+    def collect(self, b, vertices, pendantOf, fixed, free):
+        self.offer(free[0], self.liftLocal(vertices, pendantOf, free[1]))
+        if fixed[0] <= 0:
+            return
+        path = fixed[1]
+        end = path[-1]
+        if end in pendantOf:
+            segment, nextCut = [vertices[i] for i in path[1:-1]], pendantOf[end]
+        else:
+            segment, nextCut = [vertices[i] for i in path[1:]], -1
+        self.ways.setdefault(self.tree.parentCut[b], []).append((fixed[0], segment, nextCut))
+
+    # Every child block of an articulation point sits on the same level, so its down value
+    # is final once that level is done
+    def finishLevel(self):
+        for c, ways in self.ways.items():
+            ways.sort(key=lambda way: way[0], reverse=True)
+            first = ways[0]
+            self.down[c] = first
+            if len(ways) > 1:
+                second = ways[1]
+                length = first[0] + second[0]
+                if length > self.best[0]:
+                    head = second[1] + self.liftDown(second[2])
+                    tail = first[1] + self.liftDown(first[2])
+                    self.offer(length, head[::-1] + [c] + tail)
+        self.ways = {}
+
+
+# Longest simple path found by block-cut tree decomposition; returns (length, path of dense
+# indices). workers=None uses every core for levels with several large blocks.
+def searchBlockTree(g, component, workers=None, seed=0, budget=None):
+    return BlockTreeSearch(g, component, workers, seed, budget).search()
+
+
+class BlockOwnHeuristic:
+    # The Own Heuristic run block by block over the block-cut tree, registered next to the
+    # other LSP algorithms. workers=1 solves every block in this process, which is what a
+    # worker of the batch pool needs; block trial seeds come from the global random state.
+    def __init__(self, workers=1):
+        self.workers = workers
+
+    def searchLSP(self, component, g):
+        return searchBlockTree(g, component, self.workers, random.getrandbits(63))[0]
+
+    # The budget is checked after every block, so one block search is the granularity
+    def searchAnytime(self, g, component, budget=None):
+        budget = budget or Budget()
+        budget.start()
+        searchBlockTree(g, component, self.workers, random.getrandbits(63), budget)
+        return budget.result()
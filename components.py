@@ -0,0 +1,54 @@
+from array import array
+
+
+class Components:
+    # Result of one labelling pass: labels[v] is the component of dense vertex v,
+    # sizes[c] the number of vertices in component c and lcc the members of the largest one
+    def __init__(self, labels, sizes, lcc):
+        self.labels = labels
+        self.sizes = sizes
+        self.lcc = lcc
+
+    def count(self):
+        return len(self.sizes)
+
+    def largestLabel(self):
+        return self.labels[self.lcc[0]] if self.lcc else -1
+
+
+# Label every connected component of a CSR graph in a single breadth-first pass.
+# The queue is an array that only grows, so no recursion and no per-vertex frames are needed.
+def labelComponents(graph):
+    offsets = graph.offsets
+    neighbors = graph.neighbors
+    n = graph.numVertices()
+    labels = array('i', [-1]) * n
+    sizes = array('i')
+    order = array('i', bytes(4 * n))
+    starts = array('i')
+
+    tail = 0
+    for root in range(n):
+        if labels[root] != -1:
+            continue
+        label = len(sizes)
+        labels[root] = label
+        head = tail
+        order[tail] = root
+        tail += 1
+        starts.append(head)
+        while head < tail:
+            u = order[head]
+            head += 1
+            for w in neighbors[offsets[u]:offsets[u + 1]]:
+                if labels[w] == -1:
+                    labels[w] = label
+                    order[tail] = w
+                    tail += 1
+        sizes.append(tail - starts[label])
+
+    if not sizes:
+        return Components(labels, sizes, array('i'))
+    largest = max(range(len(sizes)), key=sizes.__getitem__)
+    lcc = order[starts[largest]:starts[largest] + sizes[largest]]
+    return Components(labels, sizes, lcc)
@@ -0,0 +1,170 @@
+from array import array
+
+from components import labelComponents
+from degreeStats import csrDegreeStats
+from instrumentation import phase
+
+
+# Counting-pass CSR rows over dense vertices 0..n-1 from parallel edge endpoint sequences,
+# with the matching per-entry weights when weights (one per edge) is given. Every row lists
+# its neighbors in edge order. Returns (offsets, neighbors, row weights or None).
+def csrArrays(n, us, vs, weights=None):
+    degree = [0] * (n + 1)
+    for u in us:
+        degree[u + 1] += 1
+    for v in vs:
+        degree[v + 1] += 1
+    for i in range(n):
+        degree[i + 1] += degree[i]
+    offsets = array('i', degree)
+
+    fill = degree[:n]
+    neighbors = array('i', bytes(4 * offsets[n]))
+    rowWeights = None if weights is None else array('i', bytes(4 * offsets[n]))
+    for e, (u, v) in enumerate(zip(us, vs)):
+        neighbors[fill[u]] = v
+        neighbors[fill[v]] = u
+        if rowWeights is not None:
+            rowWeights[fill[u]] = weights[e]
+            rowWeights[fill[v]] = weights[e]
+        fill[u] += 1
+        fill[v] += 1
+    return offsets, neighbors, rowWeights
+
+
+class CSRVertex:
+    __slots__ = ("x", "y", "node", "distance", "parent")
+
+    # Lightweight vertex handle for a dense CSR index, created only when an algorithm asks for one
+    def __init__(self, x, y, node):
+        self.x = x
+        self.y = y
+        self.node = node
+        self.distance = float('-inf')
+        self.parent = None
+
+
+class CSRAdjacency:
+    # Expose the CSR rows through the adjList[v] interface the LSP algorithms already use
+    def __init__(self, offsets, neighbors):
+        self.offsets = offsets
+        self.neighbors = neighbors
+
+    def __getitem__(self, v):
+        return self.neighbors[self.offsets[v]:self.offsets[v + 1]]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        return iter(range(len(self)))
+
+    def __contains__(self, v):
+        return 0 <= v < len(self)
+
+    def items(self):
+        for v in range(len(self)):
+            yield v, self[v]
+
+
+class CSRVertexMap:
+    # Map a dense index to a vertex handle without keeping one object per node alive
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, v):
+        return CSRVertex(self.graph.xs[v], self.graph.ys[v], v)
+
+    def __len__(self):
+        return self.graph.numVertices()
+
+    def __contains__(self, v):
+        return 0 <= v < self.graph.numVertices()
+
+
+class CSRGraph:
+    # Array-backed graph: vertex IDs are remapped to 0..n-1, neighbors of v live in
+    # neighbors[offsets[v]:offsets[v + 1]] and coordinates are held in parallel float arrays.
+    # weights, when given, holds the length of each neighbors entry; None means unit edges.
+    def __init__(self, ids, offsets, neighbors, xs=None, ys=None, weights=None):
+        n = len(offsets) - 1
+        self.ids = ids
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.weights = weights
+        self.xs = xs if xs is not None else array('d', bytes(8 * n))
+        self.ys = ys if ys is not None else array('d', bytes(8 * n))
+        self.adjList = CSRAdjacency(offsets, neighbors)
+        self.verticeMap = CSRVertexMap(self)
+        self.verticeSet = range(n)
+        self.hasCoordinates = False
+        self.idIndex = None
+        self.componentCache = None
+        self.degreeStatsCache = None
+
+    # Build a CSR graph from parallel arrays of edge endpoints given as original vertex IDs
+    @classmethod
+    def fromEdgeArrays(cls, us, vs, coords=None):
+        ids = array('q', sorted(set(us).union(vs)))
+        index = {node: i for i, node in enumerate(ids)}
+        n = len(ids)
+
+        offsets, neighbors, _ = csrArrays(n, [index[u] for u in us], [index[v] for v in vs])
+
+        xs = array('d', bytes(8 * n))
+        ys = array('d', bytes(8 * n))
+        if coords:
+            for node, (x, y) in coords.items():
+                i = index[node]
+                xs[i] = x
+                ys[i] = y
+
+        graph = cls(ids, offsets, neighbors, xs, ys)
+        graph.hasCoordinates = bool(coords)
+        graph.idIndex = index
+        return graph
+
+    def numVertices(self):
+        return len(self.offsets) - 1
+
+    def numEdges(self):
+        return self.offsets[-1] // 2
+
+    def degree(self, v):
+        return self.offsets[v + 1] - self.offsets[v]
+
+    # Dense index of an original vertex ID from the input file
+    def indexOf(self, node):
+        if self.idIndex is None:
+            self.idIndex = {node: i for i, node in enumerate(self.ids)}
+        return self.idIndex[node]
+
+    # Connected-component labels, sizes and LCC, computed once and shared by every caller
+    def components(self):
+        if self.componentCache is None:
+            with phase("lcc"):
+                self.componentCache = labelComponents(self)
+        return self.componentCache
+
+    # Largest connected component as dense indices, or as vertex handles when d == 1
+    def findLCC(self, d=0):
+        lcc = self.components().lcc
+        if d == 1:
+            return [self.verticeMap[v] for v in lcc]
+        return lcc
+
+    # Exact degree histogram of the LCC, computed once
+    def lccDegreeStats(self):
+        if self.degreeStatsCache is None:
+            lcc = self.components().lcc
+            with phase("degrees"):
+                self.degreeStatsCache = csrDegreeStats(self, lcc)
+        return self.degreeStatsCache
+
+    # Maximum and average degree over the largest connected component
+    def getlccdegrees(self, lcc):
+        if self.componentCache is not None and lcc is self.componentCache.lcc:
+            stats = self.lccDegreeStats()
+        else:
+            stats = csrDegreeStats(self, lcc)
+        return stats.maxDegree(), stats.averageDegree()
@@ -0,0 +1,50 @@
+from array import array
+from collections import Counter
+from operator import sub
+
+
+class DegreeStats:
+    # Exact degree summary of a vertex set: histogram[k] is the number of vertices with degree k
+    def __init__(self, histogram, count, total):
+        self.histogram = histogram
+        self.count = count
+        self.total = total
+
+    def maxDegree(self):
+        return len(self.histogram) - 1 if self.count else 0
+
+    def averageDegree(self):
+        return self.total / self.count if self.count else 0
+
+    def minDegree(self):
+        for degree, frequency in enumerate(self.histogram):
+            if frequency:
+                return degree
+        return 0
+
+    # Fraction of vertices having each degree, indexed by degree
+    def distribution(self):
+        if not self.count:
+            return []
+        return [frequency / self.count for frequency in self.histogram]
+
+
+# Build the summary from an iterable of per-vertex degrees in one pass
+def fromDegrees(degrees):
+    counts = Counter(degrees)
+    if not counts:
+        return DegreeStats(array('i'), 0, 0)
+    histogram = array('i', bytes(4 * (max(counts) + 1)))
+    for degree, frequency in counts.items():
+        histogram[degree] = frequency
+    return DegreeStats(histogram, sum(counts.values()), sum(d * f for d, f in counts.items()))
+
+
+# O(V) degree statistics of a CSR graph, restricted to vertices when given (e.g. the LCC)
+def csrDegreeStats(graph, vertices=None):
+    offsets = graph.offsets
+    degrees = list(map(sub, offsets[1:], offsets[:-1]))
+    if vertices is not None and len(vertices) != len(degrees):
+        degrees = map(degrees.__getitem__, vertices)
+    return fromDegrees(degrees)
+
@@ -0,0 +1,184 @@
+import argparse
+import csv
+import json
+import math
+import os
+import random
+from multiprocessing import Pool
+
+from algorithms import ALGORITHMS, EXTRA_ALGORITHMS, runAlgorithm
+from generateGraph import GeometricGraph
+
+# (n, minFraction, maxFraction) settings used by Driver.generate()
+DEFAULT_CONFIGS = [(300, 0.9, 0.95), (400, 0.8, 0.9), (500, 0.7, 0.8)]
+
+
+# Deterministic seed for the k-th instance of a configuration, independent of worker order
+def instanceSeed(baseSeed, n, minFraction, maxFraction, k):
+    return random.Random(f"{baseSeed}:{n}:{minFraction}:{maxFraction}:{k}").getrandbits(63)
+
+
+# Build one seeded random geometric instance and run every requested algorithm on it.
+# Runs in a worker process; only the small result dict travels back to the parent.
+def runInstance(task):
+    n, minFraction, maxFraction, seed, algorithms = task
+    geometric = GeometricGraph(n, seed)
+    r = geometric.fitRadius(minFraction, maxFraction)
+    geometric.addEdges(r)
+    g = geometric.toCSR()
+    del geometric
+
+    lcc = g.findLCC()
+    maxDegree, averageDegree = g.getlccdegrees(lcc)
+    random.seed(seed)
+    results = {name: runAlgorithm(name, g) for name in algorithms}
+    return {
+        "n": n,
+        "minFraction": minFraction,
+        "maxFraction": maxFraction,
+        "seed": seed,
+        "r": r,
+        "lcc": len(lcc),
+        "maxDegree": maxDegree,
+        "averageDegree": averageDegree,
+        "lsp": results,
+    }
+
+
+def percentile(ordered, q):
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * q
+    low = math.floor(position)
+    high = math.ceil(position)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+class RunningStats:
+    # Welford mean/variance plus the raw values, which are one float per instance
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.values = []
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.values.append(value)
+
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def summary(self):
+        ordered = sorted(self.values)
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "variance": self.variance(),
+            "min": ordered[0] if ordered else None,
+            "p5": percentile(ordered, 0.05),
+            "p50": percentile(ordered, 0.5),
+            "p95": percentile(ordered, 0.95),
+            "max": ordered[-1] if ordered else None,
+        }
+
+
+class Aggregator:
+    # Per (n, fractions, metric) statistics, rewritten to disk after every finished instance
+    def __init__(self, output, outputFormat):
+        self.output = output
+        self.outputFormat = outputFormat
+        self.stats = {}
+
+    def add(self, result):
+        config = (result["n"], result["minFraction"], result["maxFraction"])
+        metrics = {"r": result["r"], "lcc": result["lcc"],
+                   "maxDegree": result["maxDegree"], "averageDegree": result["averageDegree"]}
+        metrics.update(("LSP " + name, value) for name, value in result["lsp"].items())
+        for metric, value in metrics.items():
+            self.stats.setdefault(config + (metric,), RunningStats()).add(value)
+
+    def rows(self):
+        rows = []
+        for (n, minFraction, maxFraction, metric), stats in self.stats.items():
+            row = {"n": n, "minFraction": minFraction, "maxFraction": maxFraction, "metric": metric}
+            row.update(stats.summary())
+            rows.append(row)
+        return rows
+
+    # Write to a temporary file and rename, so readers never see a half-written report
+    def flush(self):
+        if not self.output:
+            return
+        rows = self.rows()
+        temp = self.output + ".tmp"
+        with open(temp, 'w', newline='') as out:
+            if self.outputFormat == "csv":
+                writer = csv.DictWriter(out, fieldnames=list(rows[0]) if rows else ["metric"])
+                writer.writeheader()
+                writer.writerows(rows)
+            else:
+                json.dump(rows, out, indent=2)
+        os.replace(temp, self.output)
+
+
+def generateTasks(configs, instances, algorithms, baseSeed):
+    for n, minFraction, maxFraction in configs:
+        for k in range(instances):
+            yield (n, minFraction, maxFraction,
+                   instanceSeed(baseSeed, n, minFraction, maxFraction, k), algorithms)
+
+
+# Run `instances` seeded graphs per configuration on a process pool. Tasks are generated
+# lazily and handed out one at a time, so only about one instance per worker is alive.
+def runExperiments(configs, instances, algorithms, baseSeed=0, workers=None,
+                   output=None, outputFormat="json", onResult=None):
+    aggregator = Aggregator(output, outputFormat)
+    tasks = generateTasks(configs, instances, algorithms, baseSeed)
+    with Pool(processes=workers or os.cpu_count()) as pool:
+        for result in pool.imap_unordered(runInstance, tasks, chunksize=1):
+            aggregator.add(result)
+            aggregator.flush()
+            if onResult is not None:
+                onResult(result)
+    return aggregator.rows()
+
+
+def parseConfig(text):
+    n, minFraction, maxFraction = text.split(":")
+    return int(n), float(minFraction), float(maxFraction)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo LSP experiments on random geometric graphs")
+    parser.add_argument("--config", action="append", type=parseConfig, metavar="N:MIN:MAX",
+                        help="vertex count and LCC fraction window (repeatable)")
+    parser.add_argument("--instances", type=int, default=10, help="seeded instances per configuration")
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS),
+                        choices=list(ALGORITHMS) + list(EXTRA_ALGORITHMS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="defaults to all cores")
+    parser.add_argument("--output", default="experiments.json")
+    parser.add_argument("--format", choices=["json", "csv"], default=None,
+                        help="defaults to the output file extension")
+    args = parser.parse_args()
+
+    outputFormat = args.format or ("csv" if args.output.endswith(".csv") else "json")
+    configs = args.config or DEFAULT_CONFIGS
+    total = len(configs) * args.instances
+    done = [0]
+
+    def progress(result):
+        done[0] += 1
+        print(f"[{done[0]}/{total}] n={result['n']} seed={result['seed']} lsp={result['lsp']}")
+
+    runExperiments(configs, args.instances, args.algorithms, args.seed, args.workers,
+                   args.output, outputFormat, progress)
+    print("Aggregates written to " + args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,222 @@
-import random
+import gzip
 import math
+import random
+import struct
+from array import array
+from itertools import islice
+
+from csrGraph import CSRGraph, csrArrays
+
+# Magic, vertex count and edge count at the start of a binary geometric graph file
+BINARY_MAGIC = b"LSPGEO01"
+BINARY_HEADER = struct.Struct("<8sqq")
+# Lines joined into one string per write call by the text writers
+WRITE_BATCH = 1 << 16
+
+
+def writeLines(outFile, lines):
+    lines = iter(lines)
+    while True:
+        batch = list(islice(lines, WRITE_BATCH))
+        if not batch:
+            break
+        outFile.write("\n".join(batch) + "\n")
 
-class Vertex:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
 
 class GeometricGraph:
-    def __init__(self, n):
-        self.vertices = [Vertex(random.random(), random.random()) for _ in range(n)]
-        self.adjacencyList = [[] for _ in range(n)]
+    # Points are stored as two coordinate arrays and edges as two index arrays with
+    # us[k] < vs[k], sorted; no object is kept per point or per edge.
+    # A seed makes the point set, and any resampling of it, reproducible
+    def __init__(self, n, seed=None):
+        self.rng = random.Random(seed)
+        self.n = n
+        self.resample()
 
-    def addEdges(self, r):
-        n = len(self.vertices)
+    # Draw a fresh point set of the same size and drop all edges
+    def resample(self):
+        rand = self.rng.random
+        coords = array('d', [rand() for _ in range(2 * self.n)])
+        self.xs = coords[0::2]
+        self.ys = coords[1::2]
+        self.us = array('i')
+        self.vs = array('i')
+
+    def numVertices(self):
+        return self.n
+
+    def numEdges(self):
+        return len(self.us)
+
+    # Yield (squared distance, i, j) for every pair with i != j within distance r using a
+    # cell list: points are bucketed into r-sized cells, so only the same and adjacent
+    # cells ever have to be compared
+    def pairsWithin(self, r):
+        n = self.n
+        if n == 0 or r <= 0:
+            return
+        xs = self.xs
+        ys = self.ys
+        side = max(1, int(1 / r))
+        cells = [[] for _ in range(side * side)]
         for i in range(n):
-            for j in range(i + 1, n):
-                if self.euclideanDistance(self.vertices[i], self.vertices[j]) <= r:
-                    self.adjacencyList[i].append(j)
-                    self.adjacencyList[j].append(i)
+            cx = min(int(xs[i] * side), side - 1)
+            cy = min(int(ys[i] * side), side - 1)
+            cells[cx * side + cy].append(i)
+
+        r2 = r * r
+        # Half stencil: each unordered pair of cells is visited exactly once
+        stencil = ((0, 1), (1, -1), (1, 0), (1, 1))
+        for cx in range(side):
+            for cy in range(side):
+                cell = cells[cx * side + cy]
+                if not cell:
+                    continue
+                for a, i in enumerate(cell):
+                    xi, yi = xs[i], ys[i]
+                    for j in cell[a + 1:]:
+                        dx = xs[j] - xi
+                        dy = ys[j] - yi
+                        d2 = dx * dx + dy * dy
+                        if d2 <= r2:
+                            yield d2, i, j
+                for ox, oy in stencil:
+                    nx, ny = cx + ox, cy + oy
+                    if not (0 <= nx < side and 0 <= ny < side):
+                        continue
+                    other = cells[nx * side + ny]
+                    if not other:
+                        continue
+                    for i in cell:
+                        xi, yi = xs[i], ys[i]
+                        for j in other:
+                            dx = xs[j] - xi
+                            dy = ys[j] - yi
+                            d2 = dx * dx + dy * dy
+                            if d2 <= r2:
+                                yield d2, i, j
+
+    # Replace the edges with every pair within distance r, as sorted (us, vs) index arrays
+    def addEdges(self, r):
+        n = self.n
+        keys = sorted(i * n + j if i < j else j * n + i for _, i, j in self.pairsWithin(r))
+        self.us = array('i', [key // n for key in keys])
+        self.vs = array('i', [key % n for key in keys])
+
+    # CSRGraph with IDs 1..n, matching the files written below. The edges are sorted, so every
+    # neighbor row comes out in ascending order from a single counting pass.
+    def toCSR(self):
+        n = self.n
+        offsets, neighbors, _ = csrArrays(n, self.us, self.vs)
+        graph = CSRGraph(array('q', range(1, n + 1)), offsets, neighbors,
+                         array('d', self.xs), array('d', self.ys))
+        graph.hasCoordinates = True
+        return graph
+
+    # Percolation sweep on this point set: candidate edges are sorted by length once and
+    # merged with union-find, which gives the LCC size for every threshold r at the same time.
+    # Returns an r whose LCC holds between minFraction and maxFraction of the vertices, or
+    # None when the LCC of this point set jumps straight over that window.
+    def percolationRadius(self, minFraction, maxFraction):
+        n = self.n
+        if n < 2:
+            return 0.0
+        low = minFraction * n
+        high = maxFraction * n
+        # Start just above the connectivity threshold and widen only if it is not enough
+        rmax = math.sqrt(2 * math.log(n) / (math.pi * n))
+        while True:
+            pairs = sorted(self.pairsWithin(rmax))
+            parent = list(range(n))
+            size = [1] * n
+            largest = 1
+            rLow = None
+            rHigh = rmax
+            for d2, i, j in pairs:
+                while parent[i] != i:
+                    parent[i] = parent[parent[i]]
+                    i = parent[i]
+                while parent[j] != j:
+                    parent[j] = parent[parent[j]]
+                    j = parent[j]
+                if i == j:
+                    continue
+                if size[i] < size[j]:
+                    i, j = j, i
+                parent[j] = i
+                size[i] += size[j]
+                if size[i] > largest:
+                    largest = size[i]
+                    if rLow is None and largest >= low:
+                        rLow = math.sqrt(d2)
+                    if largest > high:
+                        rHigh = math.sqrt(d2)
+                        break
+            if rLow is not None or rmax >= math.sqrt(2):
+                break
+            rmax = min(2 * rmax, math.sqrt(2))
+
+        if rLow is None or rHigh <= rLow:
+            return None
+        return (rLow + rHigh) / 2
+
+    # Percolation radius for this instance, redrawing the points only if their LCC
+    # jumps over the whole [minFraction, maxFraction] window
+    def fitRadius(self, minFraction, maxFraction):
+        r = self.percolationRadius(minFraction, maxFraction)
+        while r is None:
+            self.resample()
+            r = self.percolationRadius(minFraction, maxFraction)
+        return r
 
     def largestConnectedComponent(self):
-        n = len(self.vertices)
-        visited = [False] * n
-        max_size = 0
-        for i in range(n):
-            if not visited[i]:
-                size = [0]
-                self.dfs(i, visited, size)
-                max_size = max(max_size, size[0])
-        return max_size
-
-    def dfs(self, vertex, visited, size):
-        visited[vertex] = True
-        size[0] += 1
-        for neighbor in self.adjacencyList[vertex]:
-            if not visited[neighbor]:
-                self.dfs(neighbor, visited, size)
+        return len(self.toCSR().findLCC())
 
     def euclideanDistance(self, u, v):
-        return math.sqrt((u.x - v.x) ** 2 + (u.y - v.y) ** 2)
+        return math.hypot(self.xs[u] - self.xs[v], self.ys[u] - self.ys[v])
 
+    # One "id x y id x y" line per edge; each vertex's line prefix is formatted once and the
+    # lines are written in large batches
     def saveGraphToFile(self, filename):
+        xs, ys = self.xs, self.ys
+        labels = [f"{i + 1} {xs[i]} {ys[i]}" for i in range(self.n)]
         with open("graphs/"+filename, 'w') as outFile:
-            n = len(self.vertices)
-            for i in range(n):
-                for j in self.adjacencyList[i]:
-                    if i < j:
-                        outFile.write(f"{i + 1} {self.vertices[i].x} {self.vertices[i].y} "
-                                      f"{j + 1} {self.vertices[j].x} {self.vertices[j].y}\n")
-                        
+            writeLines(outFile, (labels[u] + " " + labels[v] for u, v in zip(self.us, self.vs)))
+
+    # Symmetric pattern Matrix Market file: header, size line, then each edge once in the
+    # lower triangle (row > column)
     def saveGraphToMtxFile(self, filename):
+        names = [str(i + 1) for i in range(self.n)]
         with open("graphs/"+filename, 'w') as outFile:
-            n = len(self.vertices)
-            nnz = sum(len(adj) for adj in self.adjacencyList)
-            for i in range(n):
-                for j in self.adjacencyList[i]:
-                    if i <= j:
-                        outFile.write(f"{i + 1} {j + 1}\n")
\ No newline at end of file
+            outFile.write("%%MatrixMarket matrix coordinate pattern symmetric\n")
+            outFile.write(f"{self.n} {self.n} {len(self.us)}\n")
+            writeLines(outFile, (names[v] + " " + names[u] for u, v in zip(self.us, self.vs)))
+
+    # BINARY_HEADER followed by the raw xs, ys, us and vs arrays, gzip-compressed by default
+    def saveGraphToBinaryFile(self, filename, compress=True):
+        path = "graphs/"+filename
+        with (gzip.open(path, 'wb', compresslevel=6) if compress else open(path, 'wb')) as outFile:
+            outFile.write(BINARY_HEADER.pack(BINARY_MAGIC, self.n, len(self.us)))
+            for data in (self.xs, self.ys, self.us, self.vs):
+                outFile.write(data.tobytes())
+
+    # Read a file written by saveGraphToBinaryFile, compressed or not
+    @classmethod
+    def readBinaryFile(cls, filename):
+        path = "graphs/"+filename
+        with open(path, 'rb') as probe:
+            compressed = probe.read(2) == b"\x1f\x8b"
+        with (gzip.open(path, 'rb') if compressed else open(path, 'rb')) as inFile:
+            magic, n, m = BINARY_HEADER.unpack(inFile.read(BINARY_HEADER.size))
+            if magic != BINARY_MAGIC:
+                raise ValueError(path + " is not a binary geometric graph file")
+            graph = cls(0)
+            graph.n = n
+            graph.xs = array('d')
+            graph.ys = array('d')
+            graph.us = array('i')
+            graph.vs = array('i')
+            for data, count in ((graph.xs, n), (graph.ys, n), (graph.us, m), (graph.vs, m)):
+                data.frombytes(inFile.read(count * data.itemsize))
+                if len(data) != count:
+                    raise ValueError(path + " is truncated")
+        return graph
@@ -0,0 +1,111 @@
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+
+from csrGraph import CSRGraph
+
+CACHE_SUFFIX = ".csr"
+MAGIC = b"LSPCSR01"
+# magic, source size, source mtime_ns, source sha256, n, len(neighbors), has coordinates
+HEADER = struct.Struct("<8sqq32sqqq")
+
+
+def cachePath(path):
+    return path + CACHE_SUFFIX
+
+
+def fileDigest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+def align8(offset):
+    return (offset + 7) & ~7
+
+
+# Byte offsets of the ids/offsets/neighbors/xs/ys sections that follow the header
+def sectionLayout(n, m):
+    ids = HEADER.size
+    offsets = ids + 8 * n
+    neighbors = offsets + 4 * (n + 1)
+    xs = align8(neighbors + 4 * m)
+    ys = xs + 8 * n
+    return ids, offsets, neighbors, xs, ys, ys + 8 * n
+
+
+# Write the CSR arrays and coordinates of graph next to its source file
+def writeCache(path, graph, digest=None):
+    stat = os.stat(path)
+    if digest is None:
+        digest = fileDigest(path)
+    n = graph.numVertices()
+    m = len(graph.neighbors)
+    header = HEADER.pack(MAGIC, stat.st_size, stat.st_mtime_ns, digest, n, m, int(graph.hasCoordinates))
+    layout = sectionLayout(n, m)
+
+    target = cachePath(path)
+    temp = target + ".tmp"
+    try:
+        with open(temp, 'wb') as out:
+            out.write(header)
+            out.write(array('q', graph.ids).tobytes())
+            out.write(array('i', graph.offsets).tobytes())
+            out.write(array('i', graph.neighbors).tobytes())
+            out.write(bytes(layout[3] - out.tell()))
+            out.write(array('d', graph.xs).tobytes())
+            out.write(array('d', graph.ys).tobytes())
+        os.replace(temp, target)
+    except OSError:
+        # A read-only graphs/ directory just means every run parses the text file
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+# Map a cache file and return a CSRGraph whose arrays are zero-copy views into it,
+# or None when the cache is missing, corrupt or stale with respect to the source
+def readCache(path):
+    target = cachePath(path)
+    try:
+        with open(target, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    if len(mapped) < HEADER.size:
+        return None
+    magic, size, mtime, digest, n, m, hasCoordinates = HEADER.unpack_from(mapped)
+    layout = sectionLayout(n, m)
+    if magic != MAGIC or len(mapped) != layout[5]:
+        return None
+
+    stat = os.stat(path)
+    if stat.st_size != size:
+        return None
+    if stat.st_mtime_ns != mtime:
+        # Touched but possibly unchanged: trust the cache only if the content hash agrees
+        if fileDigest(path) != digest:
+            return None
+        refreshStamp(target, size, stat.st_mtime_ns, digest, n, m, hasCoordinates)
+
+    view = memoryview(mapped)
+    idsAt, offsetsAt, neighborsAt, xsAt, ysAt, end = layout
+    graph = CSRGraph(view[idsAt:offsetsAt].cast('q'),
+                     view[offsetsAt:neighborsAt].cast('i'),
+                     view[neighborsAt:neighborsAt + 4 * m].cast('i'),
+                     view[xsAt:ysAt].cast('d'),
+                     view[ysAt:end].cast('d'))
+    graph.hasCoordinates = bool(hasCoordinates)
+    return graph
+
+
+def refreshStamp(target, size, mtime, digest, n, m, hasCoordinates):
+    try:
+        with open(target, 'r+b') as file:
+            file.write(HEADER.pack(MAGIC, size, mtime, digest, n, m, hasCoordinates))
+    except OSError:
+        pass
@@ -0,0 +1,147 @@
+import os
+from array import array
+
+from csrGraph import CSRGraph
+from graphCache import readCache, writeCache
+from instrumentation import phase
+
+GRAPH_DIR = "graphs"
+CHUNK_SIZE = 1 << 23
+
+
+# Parse a Matrix Market banner such as "%%MatrixMarket matrix coordinate pattern symmetric"
+def parseMatrixMarketHeader(line):
+    parts = line.split()
+    if len(parts) < 5 or parts[1].lower() != "matrix":
+        raise ValueError("Unsupported Matrix Market header: " + line.strip())
+    header = {
+        "format": parts[2].lower(),
+        "field": parts[3].lower(),
+        "symmetry": parts[4].lower(),
+    }
+    if header["format"] != "coordinate":
+        raise ValueError("Only coordinate Matrix Market files describe graphs: " + line.strip())
+    return header
+
+
+# Yield blocks of whole lines so a large file never has to be split in one go
+def readChunks(file):
+    rest = ""
+    while True:
+        block = file.read(CHUNK_SIZE)
+        if not block:
+            break
+        block = rest + block
+        cut = block.rfind("\n")
+        if cut < 0:
+            rest = block
+            continue
+        rest = block[cut + 1:]
+        yield block[:cut + 1]
+    if rest:
+        yield rest
+
+
+def stripComments(block):
+    if "%" not in block:
+        return block
+    return "\n".join(line for line in block.split("\n") if not line.lstrip().startswith("%"))
+
+
+# Read the raw edge rows of an .edges/.mtx file into flat arrays.
+# Returns (us, vs, coordinates) where coordinates is (ux, uy, vx, vy) for
+# six-column rows carrying vertex positions, or None for plain edge lists.
+def readEdgeArrays(path):
+    us = array('q')
+    vs = array('q')
+    coordinates = None
+    columns = 0
+    header = None
+    expected = None
+
+    with open(path, 'r') as file:
+        for block in readChunks(file):
+            if header is None and block.startswith("%%MatrixMarket"):
+                newline = block.find("\n")
+                header = parseMatrixMarketHeader(block[:newline])
+                block = block[newline + 1:]
+            block = stripComments(block)
+
+            if header is not None and expected is None:
+                lines = block.lstrip().split("\n", 1)
+                if not lines[0]:
+                    continue
+                sizes = lines[0].split()
+                if len(sizes) != 3:
+                    raise ValueError("Missing Matrix Market size line in " + path)
+                expected = int(sizes[2])
+                block = lines[1] if len(lines) > 1 else ""
+
+            tokens = block.split()
+            if not tokens:
+                continue
+            if not columns:
+                columns = len(block.lstrip().split("\n", 1)[0].split())
+                if columns == 6:
+                    coordinates = (array('d'), array('d'), array('d'), array('d'))
+            if len(tokens) % columns:
+                raise ValueError("Ragged edge rows in " + path)
+
+            if columns == 6:
+                us.extend(map(int, tokens[0::6]))
+                vs.extend(map(int, tokens[3::6]))
+                ux, uy, vx, vy = coordinates
+                ux.extend(map(float, tokens[1::6]))
+                uy.extend(map(float, tokens[2::6]))
+                vx.extend(map(float, tokens[4::6]))
+                vy.extend(map(float, tokens[5::6]))
+            else:
+                us.extend(map(int, tokens[0::columns]))
+                vs.extend(map(int, tokens[1::columns]))
+
+    if expected is not None and expected != len(us):
+        raise ValueError(f"{path}: header declares {expected} entries, found {len(us)}")
+    return us, vs, coordinates
+
+
+# Drop self-loops and repeated undirected edges, keeping the first occurrence order
+def dedupEdges(us, vs):
+    pairs = dict.fromkeys(zip(map(min, us, vs), map(max, us, vs)))
+    loops = [pair for pair in pairs if pair[0] == pair[1]]
+    for pair in loops:
+        del pairs[pair]
+    if not pairs:
+        return array('q'), array('q')
+    lo, hi = zip(*pairs)
+    return array('q', lo), array('q', hi)
+
+
+# Vertex ID -> (x, y) for coordinate-carrying rows
+def coordinateMap(us, vs, coordinates):
+    if coordinates is None:
+        return None
+    ux, uy, vx, vy = coordinates
+    coords = dict(zip(vs, zip(vx, vy)))
+    coords.update(zip(us, zip(ux, uy)))
+    return coords
+
+
+# Parse a graph file into a CSRGraph with duplicate edges and self-loops removed
+def parseGraph(path):
+    us, vs, coordinates = readEdgeArrays(path)
+    coords = coordinateMap(us, vs, coordinates)
+    us, vs = dedupEdges(us, vs)
+    return CSRGraph.fromEdgeArrays(us, vs, coords)
+
+
+# Load a graph file from graphs/ straight into a CSRGraph. The binary cache next to the source
+# is used when it is still valid and rebuilt otherwise.
+def loadGraph(filename, cache=True):
+    path = os.path.join(GRAPH_DIR, filename)
+    with phase("load"):
+        graph = readCache(path) if cache else None
+        if graph is None:
+            graph = parseGraph(path)
+            if cache:
+                writeCache(path, graph)
+    return graph
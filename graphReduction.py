@@ -0,0 +1,196 @@
+from array import array
+
+from csrGraph import CSRGraph, csrArrays
+
+
+class Reduction:
+    # A component shrunk for longest-path search. graph is a weighted CSRGraph holding the
+    # branch vertices of the component plus pendant vertices for their hanging trees and
+    # dead-end chains, joined by super-edges whose weight is the number of original edges
+    # they stand for. liftPath maps a path on graph back to dense
+    # indices of the original graph.
+    def __init__(self, graph, original, interiors, chains, treePath):
+        self.graph = graph
+        self.original = original
+        self.interiors = interiors
+        self.chains = chains
+        self.treePath = treePath
+
+    def component(self):
+        return list(range(self.graph.numVertices()))
+
+    # Original vertex a reduced vertex stands for; a pendant stands for the deep end of its chain
+    def vertexOf(self, r):
+        v = self.original[r]
+        return v if v >= 0 else self.chains[r][-1]
+
+    # Original vertices strictly after a's vertex up to and including b's
+    def expand(self, a, b):
+        if self.original[b] < 0:
+            return self.chains[b]
+        if self.original[a] < 0:
+            return self.chains[a][-2::-1] + [self.original[b]]
+        u, v = self.original[a], self.original[b]
+        if u < v:
+            return self.interiors[u, v] + [v]
+        return self.interiors[v, u][::-1] + [v]
+
+    def liftPath(self, path):
+        if not path:
+            return []
+        lifted = [self.vertexOf(path[0])]
+        for a, b in zip(path, path[1:]):
+            lifted.extend(self.expand(a, b))
+        return lifted
+
+    # Lifted path, or the longest path inside the pruned trees when that one is longer
+    def bestPath(self, path):
+        lifted = self.liftPath(path)
+        return self.treePath if len(self.treePath) > len(lifted) else lifted
+
+
+# Chain of vertices under v along its deepest hanging branch
+def hangChain(v, below):
+    chain = []
+    v = below[v]
+    while v != -1:
+        chain.append(v)
+        v = below[v]
+    return chain
+
+
+# Reduce component (dense indices or vertex handles of a connected component of g):
+#  1. Leaf pruning: vertices of degree 1 are stripped repeatedly. Every surviving vertex keeps
+#     the depth of its deepest hanging tree, and the longest path running inside the trees
+#     (two deepest branches at one vertex) is kept as a fallback answer.
+#  2. Chain contraction: what remains has minimum degree 2. Maximal runs of degree-2 vertices
+#     without hanging trees become one super-edge between their branch vertices. Of parallel
+#     super-edges only the longest is kept. A path can still end inside a dropped one, or
+#     inside a run that closes on its own branch vertex, so the longest such run at each
+#     branch vertex is kept as a dead-end chain of that vertex.
+#  3. Each branch vertex gets one pendant vertex for its hanging tree and one for its
+#     dead-end chain, weighted by their length, so paths may end down either.
+def reduceGraph(g, component):
+    offsets = g.offsets
+    neighbors = g.neighbors
+    members = [getattr(v, 'node', v) for v in component]
+    n = g.numVertices()
+
+    inCore = bytearray(n)
+    degree = array('i', bytes(4 * n))
+    for v in members:
+        inCore[v] = 1
+    for v in members:
+        degree[v] = sum(inCore[w] for w in neighbors[offsets[v]:offsets[v + 1]])
+
+    hang = array('i', bytes(4 * n))
+    below = array('i', [-1]) * n
+    second = array('i', bytes(4 * n))
+    secondBelow = array('i', [-1]) * n
+    queue = [v for v in members if degree[v] == 1]
+    while queue:
+        u = queue.pop()
+        if degree[u] != 1:
+            # Last vertex of a component that is a tree; it stays as the core
+            continue
+        inCore[u] = 0
+        degree[u] = 0
+        for p in neighbors[offsets[u]:offsets[u + 1]]:
+            if not inCore[p]:
+                continue
+            depth = hang[u] + 1
+            if depth > hang[p]:
+                second[p], secondBelow[p] = hang[p], below[p]
+                hang[p], below[p] = depth, u
+            elif depth > second[p]:
+                second[p], secondBelow[p] = depth, u
+            degree[p] -= 1
+            if degree[p] == 1:
+                queue.append(p)
+            break
+
+    treePath = []
+    if members:
+        top = max(members, key=lambda v: hang[v] + second[v])
+        other = secondBelow[top]
+        down = [other] + hangChain(other, below) if other != -1 else []
+        treePath = down[::-1] + [top] + hangChain(top, below)
+
+    core = [v for v in members if inCore[v]]
+    branch = bytearray(n)
+    for v in core:
+        if degree[v] != 2 or hang[v] > 0:
+            branch[v] = 1
+    if core and not any(branch[v] for v in core):
+        # The core is a single cycle; any vertex can be where it is cut open
+        branch[core[0]] = 1
+
+    deadEnds = {}
+    parallel = {}
+    walked = bytearray(n)
+    for b in core:
+        if not branch[b]:
+            continue
+        for w in neighbors[offsets[b]:offsets[b + 1]]:
+            if not inCore[w] or walked[w]:
+                continue
+            previous, current = b, w
+            interior = []
+            while not branch[current]:
+                walked[current] = 1
+                interior.append(current)
+                for x in neighbors[offsets[current]:offsets[current + 1]]:
+                    if inCore[x] and x != previous:
+                        previous, current = current, x
+                        break
+            if current == b:
+                if len(interior) > len(deadEnds.get(b, ())):
+                    deadEnds[b] = interior
+                continue
+            key = (b, current) if b < current else (current, b)
+            if b > current:
+                interior.reverse()
+            parallel.setdefault(key, []).append(interior)
+
+    interiors = {}
+    for (u, v), runs in parallel.items():
+        runs.sort(key=len, reverse=True)
+        interiors[u, v] = runs[0]
+        # Each dropped run becomes a dead end of the endpoint it lengthens most; giving it to
+        # both could let one path enter it from either side
+        for run in runs[1:]:
+            gainU = len(run) - len(deadEnds.get(u, ()))
+            gainV = len(run) - len(deadEnds.get(v, ()))
+            if gainU >= gainV and gainU > 0:
+                deadEnds[u] = run
+            elif gainV > 0:
+                deadEnds[v] = run[::-1]
+
+    index = {}
+    original = array('i')
+    for v in core:
+        if branch[v]:
+            index[v] = len(original)
+            original.append(v)
+    edges = [(index[u], index[v], len(interior) + 1) for (u, v), interior in interiors.items()]
+    pendantChains = {}
+    for r in range(len(original)):
+        v = original[r]
+        for chain in (hangChain(v, below), deadEnds.get(v)):
+            if chain:
+                pendantChains[len(original)] = chain
+                edges.append((r, len(original), len(chain)))
+                original.append(-1)
+
+    k = len(original)
+    reducedOffsets, reducedNeighbors, weights = csrArrays(
+        k, [a for a, _, _ in edges], [b for _, b, _ in edges], [w for _, _, w in edges])
+
+    reduction = Reduction(None, original, interiors, pendantChains, treePath)
+    stands = [reduction.vertexOf(r) for r in range(k)]
+    graph = CSRGraph(array('q', (g.ids[v] for v in stands)), reducedOffsets, reducedNeighbors,
+                     array('d', (g.xs[v] for v in stands)), array('d', (g.ys[v] for v in stands)),
+                     weights)
+    graph.hasCoordinates = g.hasCoordinates
+    reduction.graph = graph
+    return reduction
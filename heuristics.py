@@ -0,0 +1,116 @@
+import math
+import random
+from array import array
+
+
+# Hop distances from source to every vertex of a CSRGraph (-1 where unreachable)
+def bfsDistances(g, source):
+    offsets = g.offsets
+    neighbors = g.neighbors
+    dist = array('i', [-1]) * g.numVertices()
+    dist[source] = 0
+    queue = array('i', [source])
+    head = 0
+    while head < len(queue):
+        v = queue[head]
+        head += 1
+        d = dist[v] + 1
+        for w in neighbors[offsets[v]:offsets[v + 1]]:
+            if dist[w] == -1:
+                dist[w] = d
+                queue.append(w)
+    return dist
+
+
+class LandmarkIndex:
+    # ALT heuristic: BFS distances from k landmarks, stored as one int array per landmark.
+    # By the triangle inequality |d(l, u) - d(l, t)| never exceeds d(u, t), so the maximum
+    # over landmarks is a graph-only lower bound on the hop distance from u to t.
+    # Landmarks are picked farthest-first: each new one maximises its distance to the others.
+    def __init__(self, g, component, k=8, seed=None):
+        rng = random.Random(seed) if seed is not None else random
+        members = [getattr(v, 'node', v) for v in component]
+        self.landmarks = []
+        self.distances = []
+        if not members:
+            return
+        closest = None
+        landmark = members[rng.randrange(len(members))]
+        for _ in range(min(k, len(members))):
+            dist = bfsDistances(g, landmark)
+            self.landmarks.append(landmark)
+            self.distances.append(dist)
+            if closest is None:
+                closest = array('i', dist)
+            else:
+                for v in members:
+                    if dist[v] < closest[v]:
+                        closest[v] = dist[v]
+            landmark = max(members, key=closest.__getitem__)
+            if closest[landmark] == 0:
+                break
+
+    # Lower bound on the hops from a vertex to the nearest of several targets: every target's
+    # distance to landmark l lies in [low, high], so |d(l, u) - d(l, t)| >= the gap to that range
+    def setEstimator(self, targets):
+        ranges = []
+        for dist in self.distances:
+            values = [dist[t] for t in targets]
+            ranges.append((dist, min(values), max(values)))
+
+        def estimate(u):
+            best = 0
+            for dist, low, high in ranges:
+                d = dist[u]
+                gap = low - d if d < low else d - high
+                if gap > best:
+                    best = gap
+            return best
+        return estimate
+
+    def estimate(self, u, t):
+        best = 0
+        for dist in self.distances:
+            gap = dist[u] - dist[t]
+            if gap < 0:
+                gap = -gap
+            if gap > best:
+                best = gap
+        return best
+
+
+class CoordinateHeuristic:
+    # Straight-line lower bound on hops for geometric graphs: no edge is longer than the
+    # longest edge in the graph, so reaching t from u takes at least dist(u, t) / longest hops
+    def __init__(self, g):
+        self.xs = g.xs
+        self.ys = g.ys
+        longest = 0.0
+        offsets = g.offsets
+        neighbors = g.neighbors
+        xs, ys = self.xs, self.ys
+        for v in range(g.numVertices()):
+            for w in neighbors[offsets[v]:offsets[v + 1]]:
+                length = (xs[v] - xs[w]) ** 2 + (ys[v] - ys[w]) ** 2
+                if length > longest:
+                    longest = length
+        self.scale = 1 / math.sqrt(longest) if longest else 0.0
+
+    # Straight-line distance to the bounding box of the targets never exceeds the distance to
+    # the nearest target, so the scaled box distance is a set lower bound
+    def setEstimator(self, targets):
+        xs, ys, scale = self.xs, self.ys, self.scale
+        left = min(xs[t] for t in targets)
+        right = max(xs[t] for t in targets)
+        bottom = min(ys[t] for t in targets)
+        top = max(ys[t] for t in targets)
+
+        def estimate(u):
+            x, y = xs[u], ys[u]
+            dx = left - x if x < left else (x - right if x > right else 0.0)
+            dy = bottom - y if y < bottom else (y - top if y > top else 0.0)
+            return math.sqrt(dx * dx + dy * dy) * scale
+        return estimate
+
+    def estimate(self, u, t):
+        return math.sqrt((self.xs[u] - self.xs[t]) ** 2 + (self.ys[u] - self.ys[t]) ** 2) * self.scale
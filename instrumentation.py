@@ -0,0 +1,76 @@
+import time
+from contextlib import contextmanager, nullcontext
+
+# Stats object receiving timers and counters, or None when instrumentation is off
+active = None
+DISABLED = nullcontext()
+
+
+class Stats:
+    # Accumulated wall-clock seconds per phase and named hot-path counters. Search loops count
+    # into local variables and hand the totals over once per call, so the loops themselves
+    # never touch this object.
+    def __init__(self):
+        self.timers = {}
+        self.counters = {}
+
+    def addTime(self, name, seconds):
+        self.timers[name] = self.timers.get(name, 0.0) + seconds
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.addTime(name, time.perf_counter() - started)
+
+    # Add another Stats, or its asDict() form as sent back by a worker process
+    def merge(self, other):
+        if isinstance(other, Stats):
+            other = other.asDict()
+        for name, seconds in other["timers"].items():
+            self.addTime(name, seconds)
+        for name, value in other["counters"].items():
+            self.count(name, value)
+
+    def asDict(self):
+        return {"timers": dict(self.timers), "counters": dict(self.counters)}
+
+    # Flat {column: value} view used for table and CSV output; timers get a " s" suffix
+    def columns(self):
+        row = {name + " s": round(seconds, 4) for name, seconds in self.timers.items()}
+        row.update(self.counters)
+        return row
+
+
+def current():
+    return active
+
+
+# Route phase() and count() calls to stats (a new Stats by default) inside the block
+@contextmanager
+def collecting(stats=None):
+    global active
+    if stats is None:
+        stats = Stats()
+    previous = active
+    active = stats
+    try:
+        yield stats
+    finally:
+        active = previous
+
+
+def phase(name):
+    if active is None:
+        return DISABLED
+    return active.phase(name)
+
+
+def count(name, value=1):
+    if active is not None:
+        active.count(name, value)
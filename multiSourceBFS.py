@@ -0,0 +1,54 @@
+class SweepResult:
+    # eccentricity[i] and farthest[i] describe the BFS from sources[i]
+    def __init__(self, sources, eccentricity, farthest):
+        self.sources = sources
+        self.eccentricity = eccentricity
+        self.farthest = farthest
+
+
+# Breadth-first search from many sources at once on a CSRGraph. Every vertex carries an
+# integer bitset with bit i set once source i has reached it, so one pass over a vertex's
+# neighbors advances all sources together. Python ints are unbounded, so the batch is not
+# limited to 64 sources, although 64 keeps the bit operations on single machine words.
+def bitParallelBFS(g, sources):
+    offsets = g.offsets
+    neighbors = g.neighbors
+    k = len(sources)
+    seen = [0] * g.numVertices()
+    frontier = {}
+    for i, s in enumerate(sources):
+        seen[s] |= 1 << i
+        frontier[s] = frontier.get(s, 0) | (1 << i)
+
+    eccentricity = [0] * k
+    farthest = list(sources)
+    level = 0
+    while frontier:
+        level += 1
+        reached = {}
+        for v, bits in frontier.items():
+            for w in neighbors[offsets[v]:offsets[v + 1]]:
+                new = bits & ~seen[w]
+                if new:
+                    seen[w] |= new
+                    reached[w] = reached.get(w, 0) | new
+        for w, bits in reached.items():
+            while bits:
+                low = bits & -bits
+                i = low.bit_length() - 1
+                eccentricity[i] = level
+                farthest[i] = w
+                bits ^= low
+        frontier = reached
+    return SweepResult(sources, eccentricity, farthest)
+
+
+# Run bitParallelBFS over any number of sources in batches of `width`
+def sweep(g, sources, width=64):
+    eccentricity = []
+    farthest = []
+    for start in range(0, len(sources), width):
+        result = bitParallelBFS(g, sources[start:start + width])
+        eccentricity.extend(result.eccentricity)
+        farthest.extend(result.farthest)
+    return SweepResult(list(sources), eccentricity, farthest)
@@ -0,0 +1,156 @@
+import os
+import random
+import time
+from array import array
+from multiprocessing import Pool, shared_memory
+
+from csrGraph import CSRGraph
+
+# Graph and component attached by each worker process once, in poolInit
+workerGraph = None
+workerComponent = None
+workerBlocks = []
+
+
+class SharedGraph:
+    # Copies the CSR offsets/neighbors arrays, the component and any edge weights into shared
+    # memory blocks. Only the block names and lengths (descriptor) are sent to workers, never
+    # the arrays.
+    def __init__(self, g, component):
+        members = array('i', (getattr(v, 'node', v) for v in component))
+        self.blocks = []
+        self.descriptor = tuple(self.share(data) for data in
+                                (array('i', g.offsets), array('i', g.neighbors), members))
+        self.descriptor += (None if g.weights is None else self.share(array('i', g.weights)),)
+
+    def share(self, data):
+        size = max(1, len(data) * data.itemsize)
+        block = shared_memory.SharedMemory(create=True, size=size)
+        block.buf[:len(data) * data.itemsize] = data.tobytes()
+        self.blocks.append(block)
+        return block.name, len(data)
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+def attach(name, length):
+    block = shared_memory.SharedMemory(name=name)
+    workerBlocks.append(block)
+    return block.buf[:4 * length].cast('i')
+
+
+def poolInit(descriptor):
+    global workerGraph, workerComponent
+    (offsetsName, offsetsLen), (neighborsName, neighborsLen), (componentName, componentLen), \
+        weights = descriptor
+    offsets = attach(offsetsName, offsetsLen)
+    workerGraph = CSRGraph(array('q', range(offsetsLen - 1)), offsets,
+                           attach(neighborsName, neighborsLen),
+                           weights=None if weights is None else attach(*weights))
+    workerComponent = attach(componentName, componentLen)
+
+
+def trialSeed(seed, index):
+    return random.Random(f"{seed}:{index}").getrandbits(63)
+
+
+# One independent trial on the worker's attached graph; returns (length, index, path)
+def runTrial(task):
+    kind, index, seed = task
+    rng = random.Random(seed)
+    start = workerComponent[rng.randrange(len(workerComponent))]
+    if kind == "dfs":
+        from DFSLSP import DFS
+        from multiSourceBFS import bitParallelBFS
+        far = bitParallelBFS(workerGraph, [start]).farthest[0]
+        length, path = DFS().findDeepestPath(far, workerGraph)
+    else:
+        from OwnHeuristicLSP import OwnHeuristic
+        length, path = OwnHeuristic().findLongestPathFromNode(start, workerGraph, {})
+    return length, index, path
+
+
+# Fan `trials` seeded trials of kind "dfs" or "own" out to a worker pool and keep the
+# longest result. Trial i always uses the same seed, and ties go to the lowest trial index,
+# so the answer does not depend on the number of workers or on completion order.
+def runTrials(g, component, kind, trials, workers=None, seed=0):
+    shared = SharedGraph(g, component)
+    best = (-1, trials, [])
+    try:
+        tasks = [(kind, i, trialSeed(seed, i)) for i in range(trials)]
+        with Pool(processes=workers or os.cpu_count(), initializer=poolInit,
+                  initargs=(shared.descriptor,)) as pool:
+            for length, index, path in pool.imap_unordered(runTrial, tasks):
+                if length > best[0] or (length == best[0] and index < best[1]):
+                    best = (length, index, path)
+    finally:
+        shared.close()
+    return max(best[0], 0), best[2]
+
+
+# Run one algorithm with an optional seed; returns (name, seed, LSP value, or the path found
+# when paths is set, elapsed seconds, instrumentation Stats as a dict or None unless collect)
+def timedRun(name, seed, g, component, collect, paths=False):
+    from algorithms import runAlgorithm, searchPath
+    from instrumentation import collecting
+    run = searchPath if paths else runAlgorithm
+    if seed is not None:
+        random.seed(seed)
+    started = time.perf_counter()
+    if collect:
+        with collecting() as stats:
+            value = run(name, g, component)
+        stats = stats.asDict()
+    else:
+        value = run(name, g, component)
+        stats = None
+    return name, seed, value, time.perf_counter() - started, stats
+
+
+# Run one PARALLEL_ALGORITHMS entry in this process, with its trials spread over a worker pool
+# of its own. Returns the same tuple as timedRun with paths set; a seed of None picks a fresh
+# random one for the trials.
+def timedTrials(name, seed, g, component, workers=None, collect=False):
+    from algorithms import PARALLEL_ALGORITHMS
+    from instrumentation import collecting, phase
+    run = PARALLEL_ALGORITHMS[name]
+    trialsSeed = random.getrandbits(63) if seed is None else seed
+    started = time.perf_counter()
+    if collect:
+        with collecting() as stats:
+            with phase("search"):
+                _, path = run(g, component, workers, trialsSeed)
+        stats = stats.asDict()
+    else:
+        _, path = run(g, component, workers, trialsSeed)
+        stats = None
+    return name, seed, path, time.perf_counter() - started, stats
+
+
+# One (algorithm name, seed, collect, paths) task on the worker's attached graph
+def runAlgorithmTask(task):
+    name, seed, collect, paths = task
+    return timedRun(name, seed, workerGraph, list(workerComponent), collect, paths)
+
+
+# Run (algorithm name, seed) tasks concurrently on one graph whose LCC is already known.
+# The graph is copied into shared memory once for all tasks; a single task, or workers=1,
+# runs in this process instead. A seed of None leaves the random state untouched,
+# collect=True gathers per-task instrumentation stats and paths=True returns each search's
+# path instead of its LSP value. Results come back in task order.
+def runAlgorithms(g, component, tasks, workers=None, collect=False, paths=False):
+    if len(tasks) <= 1 or workers == 1:
+        return [timedRun(name, seed, g, component, collect, paths) for name, seed in tasks]
+
+    shared = SharedGraph(g, component)
+    try:
+        with Pool(processes=min(len(tasks), workers or os.cpu_count()), initializer=poolInit,
+                  initargs=(shared.descriptor,)) as pool:
+            return pool.map(runAlgorithmTask,
+                            [(name, seed, collect, paths) for name, seed in tasks], chunksize=1)
+    finally:
+        shared.close()
@@ -0,0 +1,136 @@
+import random
+from array import array
+
+from anytime import Budget
+from instrumentation import current
+
+
+class PathImprover:
+    # Local search that lengthens a simple path on a CSRGraph in place. pos[v] is the index of
+    # v on the path (-1 when off it), so membership tests are O(1) and every move costs
+    # O(deg) plus the length of the path segment it rewrites:
+    #  - extension appends an off-path neighbor of an endpoint,
+    #  - a Posa rotation at end v picks a path neighbor path[i] of v, reverses path[i+1:] and
+    #    so makes path[i+1] the new end; rotations that give the new end an off-path neighbor
+    #    are tried first,
+    #  - a detour inserts one or two off-path vertices between consecutive path vertices.
+    def __init__(self, g, path, seed=None):
+        self.g = g
+        self.rng = random.Random(seed)
+        self.path = list(path)
+        self.pos = array('i', [-1]) * g.numVertices()
+        for i, v in enumerate(self.path):
+            self.pos[v] = i
+        self.extensions = 0
+        self.rotations = 0
+        self.detours = 0
+
+    def freeNeighbor(self, v):
+        offsets = self.g.offsets
+        pos = self.pos
+        for w in self.g.neighbors[offsets[v]:offsets[v + 1]]:
+            if pos[w] == -1:
+                return w
+        return -1
+
+    def renumber(self, start):
+        path = self.path
+        pos = self.pos
+        for i in range(start, len(path)):
+            pos[path[i]] = i
+
+    def reverse(self):
+        self.path.reverse()
+        self.renumber(0)
+
+    # Append an off-path neighbor at either end; returns False when both ends are stuck
+    def extend(self):
+        w = self.freeNeighbor(self.path[-1])
+        if w == -1:
+            w = self.freeNeighbor(self.path[0])
+            if w == -1:
+                return False
+            self.reverse()
+        self.pos[w] = len(self.path)
+        self.path.append(w)
+        self.extensions += 1
+        return True
+
+    # Rotate at the last vertex; with lookahead only onto a new end that can be extended.
+    # Returns False when no rotation qualifies.
+    def rotate(self, lookahead):
+        path = self.path
+        pos = self.pos
+        offsets = self.g.offsets
+        end = path[-1]
+        pivots = [pos[w] for w in self.g.neighbors[offsets[end]:offsets[end + 1]]
+                  if 0 <= pos[w] < len(path) - 2]
+        if lookahead:
+            pivots = [i for i in pivots if self.freeNeighbor(path[i + 1]) != -1]
+        if not pivots:
+            return False
+        i = self.rng.choice(pivots)
+        path[i + 1:] = path[:i:-1]
+        self.renumber(i + 1)
+        self.rotations += 1
+        return True
+
+    # Insert off-path vertices between consecutive path vertices a = path[i] and path[i + 1]:
+    # one vertex x adjacent to both, or two adjacent vertices x, y joining them.
+    # Returns True after the first insertion.
+    def detour(self):
+        path = self.path
+        pos = self.pos
+        offsets = self.g.offsets
+        neighbors = self.g.neighbors
+        for i in range(len(path) - 1):
+            a, b = path[i], path[i + 1]
+            for x in neighbors[offsets[a]:offsets[a + 1]]:
+                if pos[x] != -1:
+                    continue
+                insert = None
+                for y in neighbors[offsets[x]:offsets[x + 1]]:
+                    if y == b:
+                        insert = [x]
+                        break
+                    if insert is None and pos[y] == -1 and b in neighbors[offsets[y]:offsets[y + 1]]:
+                        insert = [x, y]
+                if insert is not None:
+                    path[i + 1:i + 1] = insert
+                    self.renumber(i + 1)
+                    self.detours += 1
+                    return True
+        return False
+
+    # Apply moves until the budget runs out or `patience` rotations in a row (by default 4 per
+    # vertex of the current path) bring no new vertex onto the path. Returns (length, path).
+    def improve(self, budget=None, patience=None):
+        budget = budget or Budget()
+        stale = 0
+        while stale <= (4 * len(self.path) if patience is None else patience) and not budget.charge():
+            if self.extend():
+                stale = 0
+            elif self.rotate(True):
+                stale = 0 if self.extend() else stale + 1
+            elif stale == 0 and self.detour():
+                pass
+            elif self.rotate(False):
+                stale += 1
+            else:
+                break
+        budget.offer(len(self.path) - 1, self.path)
+
+        stats = current()
+        if stats is not None:
+            stats.count("extensions", self.extensions)
+            stats.count("rotations", self.rotations)
+            stats.count("detours", self.detours)
+        return len(self.path) - 1, self.path
+
+
+# Lengthen a simple path (dense indices, e.g. a Dijkstra.searchLSP parent chain) with
+# extensions, Posa rotations and detours within budget; returns (length, path)
+def improvePath(g, path, budget=None, seed=None, patience=None):
+    if not path:
+        return 0, []
+    return PathImprover(g, path, seed).improve(budget, patience)
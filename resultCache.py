@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+from array import array
+from collections import OrderedDict
+
+from graphLoader import GRAPH_DIR
+
+CACHE_DIR = os.path.join(GRAPH_DIR, "results")
+# Bump when a change to an algorithm makes the stored results stale
+VERSION = 3
+
+
+# sha256 of what a search sees of the LCC: member ids in component order and their CSR rows
+# (and edge weights). Equal digests mean equal search inputs, whatever the file was called.
+def lccDigest(g, lcc):
+    digest = hashlib.sha256()
+    members = [getattr(v, 'node', v) for v in lcc]
+    digest.update(array('q', (g.ids[v] for v in members)).tobytes())
+    offsets = g.offsets
+    for v in members:
+        digest.update(g.neighbors[offsets[v]:offsets[v + 1]].tobytes())
+        if g.weights is not None:
+            digest.update(g.weights[offsets[v]:offsets[v + 1]].tobytes())
+    return digest.hexdigest()
+
+
+def resultKey(digest, algorithm, parameters, seed):
+    text = json.dumps([VERSION, digest, algorithm, parameters, seed], sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ResultCache:
+    # Search results by resultKey: the `capacity` most recently used entries in memory, and
+    # every entry as <key>.json under directory. An entry is a JSON-able dict, in the Driver
+    # {"length", "path" (dense indices, or None), "seconds", "stats"}.
+    def __init__(self, directory=CACHE_DIR, capacity=256):
+        self.directory = directory
+        self.capacity = capacity
+        self.entries = OrderedDict()
+
+    def filePath(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def remember(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    # Entry stored under key, or None
+    def get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        try:
+            with open(self.filePath(key), 'r') as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        self.remember(key, entry)
+        return entry
+
+    def put(self, key, entry):
+        self.remember(key, entry)
+        target = self.filePath(key)
+        temp = target + ".tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp, 'w') as out:
+                json.dump(entry, out)
+            os.replace(temp, target)
+        except OSError:
+            # Without a writable directory the cache only lives in memory
+            if os.path.exists(temp):
+                os.remove(temp)
+
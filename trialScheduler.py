@@ -0,0 +1,102 @@
+import random
+import time
+from array import array
+from itertools import accumulate
+
+from instrumentation import count
+
+# Degree-weighted candidates drawn per start; the one farthest from earlier path endpoints wins
+CANDIDATES = 4
+
+
+class TrialScheduler:
+    # Chooses the start vertices of a heuristic's random trials and decides when to stop.
+    # Iterating yields one start per trial; after each trial the search calls record() with
+    # the best length so far and, when it has one, the path found. Starts are drawn with
+    # probability proportional to degree, never repeat, and among CANDIDATES draws the one
+    # farthest (in hops) from the endpoints of the recorded paths is taken, so later trials
+    # explore other parts of the graph. Iteration stops after maxTrials trials (sqrt(n) by
+    # default), after `patience` trials in a row without a longer path, or after `seconds`.
+    # With `order` the starts are taken from that sequence instead of being sampled.
+    def __init__(self, g, component, maxTrials=None, patience=None, seconds=None, order=None):
+        self.offsets = g.offsets
+        self.neighbors = g.neighbors
+        self.members = [getattr(v, 'node', v) for v in component]
+        n = g.numVertices()
+        if maxTrials is None:
+            maxTrials = int(len(self.members) ** 0.5)
+        if patience is None:
+            patience = max(3, int(maxTrials ** 0.5))
+        self.maxTrials = maxTrials
+        self.patience = patience
+        self.seconds = seconds
+        self.order = order
+        self.tried = bytearray(n)
+        self.distance = array('i', [n]) * n
+        self.cumulative = list(accumulate(self.offsets[v + 1] - self.offsets[v] + 1 for v in self.members))
+        self.trials = 0
+        self.stale = 0
+        self.bestLength = float('-inf')
+
+    def __iter__(self):
+        started = time.perf_counter()
+        candidates = iter(self.order) if self.order is not None else None
+        while self.trials < self.maxTrials and self.stale < self.patience:
+            if self.seconds is not None and time.perf_counter() - started >= self.seconds:
+                break
+            start = self.nextOrdered(candidates) if candidates is not None else self.nextSampled()
+            if start is None:
+                break
+            self.tried[start] = 1
+            yield start
+
+    def nextOrdered(self, candidates):
+        for v in candidates:
+            v = getattr(v, 'node', v)
+            if not self.tried[v]:
+                return v
+        return None
+
+    def nextSampled(self):
+        if not self.members:
+            return None
+        tried = self.tried
+        for _ in range(CANDIDATES):
+            drawn = [v for v in random.choices(self.members, cum_weights=self.cumulative, k=CANDIDATES)
+                     if not tried[v]]
+            if drawn:
+                return max(drawn, key=self.distance.__getitem__)
+        # Nearly every vertex has been a start; fall back to the untried ones
+        untried = [v for v in self.members if not tried[v]]
+        return random.choice(untried) if untried else None
+
+    # Close one trial: length is the best length found so far (or by this trial), path the
+    # trial's path of dense indices if it has one
+    def record(self, length, path=None):
+        self.trials += 1
+        count("trials")
+        if length > self.bestLength:
+            self.bestLength = length
+            self.stale = 0
+        else:
+            self.stale += 1
+        if path:
+            self.markEndpoints((path[0], path[-1]))
+
+    # Lower the hop distances around new endpoints; each call only walks the vertices that
+    # got closer, so repeated calls cost far less than a fresh BFS each
+    def markEndpoints(self, endpoints):
+        offsets = self.offsets
+        neighbors = self.neighbors
+        distance = self.distance
+        queue = []
+        for v in endpoints:
+            if distance[v]:
+                distance[v] = 0
+                queue.append(v)
+        for v in queue:
+            d = distance[v] + 1
+            for w in neighbors[offsets[v]:offsets[v + 1]]:
+                if distance[w] > d:
+                    distance[w] = d
+                    queue.append(w)